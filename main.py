@@ -43,6 +43,7 @@ if __name__ == '__main__':
 
         game_difficulty = 'normal'
         # game_difficulty = 'king'
+        # game_difficulty = 'mcts'
 
         # 4. Create and run the main application object.
         app = App(project_root, player_types, game_difficulty, mod_manager, level_to_play)
@@ -185,6 +185,10 @@ COLOR_CONFIRM_BG = (100, 200, 100) # Light green maybe
 AI_MOVE_DELAY_MS = 1
 AI_ACTION_TIMER_EVENT = pygame.USEREVENT + 1
 START_NEXT_TURN_EVENT = pygame.USEREVENT + 2 # NEW: For triggering the next turn
+AI_PLAN_READY_EVENT = pygame.USEREVENT + 3 # Posted by the background AI planner with its finished plan
+# Plan AI turns on a background thread while the game scene keeps drawing. The
+# planning time counts towards AI_MOVE_DELAY_MS instead of adding to it.
+AI_ASYNC_PLANNING = True
 
 # --- AI Difficulty Constants ---
 # The higher the number, the more likely an KING AI is to draw a Tree tile.
@@ -194,4 +198,60 @@ KING_AI_TREE_TILE_BIAS = 10
 # Control search space in ai_strategy.py
 # Number of possible single moves = 5 squares * 5 tiles at-hand * 4 orientations = 100
 # Number of pairs of moves to check = 100C2 = 4950 pairs of moves
-MAX_TARGETS_FOR_COMBO_SEARCH  = 5
\ No newline at end of file
+MAX_TARGETS_FOR_COMBO_SEARCH  = 5
+# Route cache in pathfinding.py: how many node sequences are remembered, and how
+# many board states are kept per sequence (make/unmake search flips between a few).
+ROUTE_CACHE_MAX_SEQUENCES = 64
+ROUTE_CACHE_ENTRIES_PER_SEQUENCE = 4
+
+# Route search used by new games: 'bfs' (reference), 'astar' (same route costs,
+# far fewer explored states on long multi-stop routes) or 'legs' (memoized per-leg search).
+DEFAULT_PATHFINDER = 'bfs'
+
+# Opt-in process-pool evaluation of HardStrategy's action pairs (ai_parallel.py).
+# Results are identical to the serial search as long as neither hits the turn's
+# deadline; below AI_PARALLEL_MIN_PAIRS the serial loop is used since shipping the
+# snapshot would cost more than it saves.
+AI_PARALLEL_COMBO_SEARCH = False
+AI_PARALLEL_WORKERS = None # None = one less than the number of CPUs
+AI_PARALLEL_MIN_PAIRS = 300
+AI_PARALLEL_RESULT_GRACE_MS = 250 # how long past the deadline to wait for worker results
+
+# Per-turn AI thinking budget in milliseconds, by difficulty (None = no limit).
+# Candidate plans are scored best-first, so when the deadline passes the AI commits
+# the best valid plan found so far instead of finishing the whole search.
+AI_TIME_BUDGET_MS = {
+    'normal': 2000,
+    'king': 5000,
+    'mcts': 5000,
+}
+
+# Board scores cached per AI turn (ai_strategy.TranspositionTable), least recently
+# used entries are dropped beyond this many states.
+AI_TRANSPOSITION_TABLE_SIZE = 50000
+
+# KingStrategy (ai_strategy.py): expectimax lookahead for the 'king' difficulty.
+KING_AI_SEARCH_PLIES = 3   # player turns searched, counting the AI's own current turn
+KING_AI_ROOT_PLANS = 6     # best two-action combos that get the deeper search
+KING_AI_DRAW_SAMPLES = 3   # most likely tile types expanded at each draw chance node
+KING_AI_REPLY_TARGETS = 6  # squares considered for moves on later plies
+
+# MCTSStrategy (ai_strategy.py): Monte Carlo playouts over the best root combos.
+MCTS_ROOT_PLANS = 8          # two-action combos the playouts choose between
+MCTS_ROLLOUT_TURNS = 3       # turns played out after the AI's own turn
+MCTS_ITERATIONS = 400        # playout cap per search (the time budget usually ends it first)
+MCTS_EXPLORATION = 1.4       # UCB1 exploration constant on rewards normalised to [0, 1]
+MCTS_RANDOM_MOVE_RATE = 0.3  # share of rollout moves picked at random instead of greedily
+MCTS_ROUTE_BONUS = 1000.0    # added to a playout's reward when the AI's route is complete
+# Opt-in root parallelisation: with more than one worker (AI_PARALLEL_WORKERS) each
+# process runs its own search over the same root plans until the turn's deadline and
+# the visit counts are summed. Off by default, like AI_PARALLEL_COMBO_SEARCH, since
+# it starts a process pool.
+MCTS_ROOT_PARALLEL = False
+
+# Strategy given to AI players for each difficulty (see ai_strategy.STRATEGIES).
+AI_STRATEGY_BY_DIFFICULTY = {
+    'normal': 'hard',
+    'king': 'king',
+    'mcts': 'mcts',
+}
@@ -0,0 +1,173 @@
+# src/game_logic/ai_parallel.py
+"""
+Opt-in process-pool evaluation of HardStrategy's two-action combos, and root-parallel
+MCTSStrategy searches.
+
+The main process enumerates the compatible pairs in the same order as the serial
+loop, stripes them across workers and ships each worker a compact, picklable
+snapshot of the board. Every shard returns its best (score, pair rank); the lowest
+rank wins among equal scores, which is exactly the pair the serial loop keeps.
+"""
+from __future__ import annotations
+from typing import List, Dict, Optional, Tuple, Any, TYPE_CHECKING
+from concurrent.futures import ProcessPoolExecutor, wait
+import multiprocessing
+import os
+import random
+import time
+
+if TYPE_CHECKING:
+    from .game import Game
+    from .player import Player
+    from .ai_actions import PotentialAction
+    from .deck_manager import DrawPile
+
+from .ai_actions import PotentialAction
+import common.constants as C
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+def worker_count() -> int:
+    """Number of worker processes the pool uses (or will use)."""
+    return C.AI_PARALLEL_WORKERS or max(1, (os.cpu_count() or 2) - 1)
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Returns the shared worker pool, creating it on first use. The pool may be created
+    from the background planner thread while pygame runs on the main thread, so
+    workers are spawned fresh rather than forked from a multi-threaded process.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=worker_count(), mp_context=multiprocessing.get_context('spawn'))
+    return _executor
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+class SearchSnapshot:
+    """
+    The subset of Game that combo scoring touches (board, rules, pathfinding,
+    tile types and terminal lookup), without the pygame, mod and UI references
+    that cannot cross a process boundary.
+    """
+    def __init__(self, game: 'Game', with_players: bool = False):
+        self.board = game.board.copy()
+        self.rule_engine = game.rule_engine
+        self.pathfinder = game.pathfinder
+        self.tile_types = game.tile_types
+        self.terminal_data = game.level_data.terminal_data
+        if with_players:
+            # Playouts also need turn order and the draw pile.
+            self.players = [p.copy() for p in game.players]
+            self.deck_manager = _DeckView(game.deck_manager.tile_draw_pile.copy())
+
+    def get_terminal_coords(self, line_number: int) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        pairs = self.terminal_data.get(str(line_number))
+        if not pairs: return None
+        return tuple(pairs[0][0][0]), tuple(pairs[1][0][0])
+
+
+class _DeckView:
+    """Stands in for DeckManager in a snapshot: only the pile is read."""
+    def __init__(self, tile_draw_pile: 'DrawPile'):
+        self.tile_draw_pile = tile_draw_pile
+
+
+def _strip_action(action: 'PotentialAction') -> Tuple[str, Dict[str, Any], float]:
+    """PotentialActions carry command lambdas, so only type, details and score are shipped."""
+    return action.action_type, action.details, action.score
+
+def _evaluate_pair_shard(snapshot: SearchSnapshot, player: 'Player', actions: List[Tuple[str, Dict[str, Any], float]], pairs: List[Tuple[int, int, int]], deadline: Optional[float]) -> Tuple[float, int]:
+    """
+    Worker entry point: searches a stripe of (rank, i, j) pairs with the same bound
+    pruning and deadline as the serial search, and returns its best (score, rank).
+    """
+    from .ai_strategy import HardStrategy
+    strategy = HardStrategy()
+    strategy.deadline = deadline
+    moves = [PotentialAction(action_type=t, details=d, score=s, command_generator=None) for t, d, s in actions]
+    plans = [[moves[i], moves[j]] for _, i, j in pairs]
+    local_score, route_bound, deltas = strategy._score_local_board(snapshot), strategy._route_score_bound(snapshot, player), {}
+    best_score, best_plan = strategy._search_plans_best_first(
+        plans, lambda plan: strategy._score_combo(snapshot, player, plan[0], plan[1]),
+        bound_plan=lambda plan: strategy._plan_score_bound(snapshot, plan, local_score, route_bound, deltas))
+    if best_plan is None: return -1.0, -1
+    return best_score, pairs[next(k for k, plan in enumerate(plans) if plan is best_plan)][0]
+
+def evaluate_pairs_in_parallel(game: 'Game', player: 'Player', sorted_moves: List['PotentialAction'], pairs: List[Tuple[int, int]], deadline: Optional[float] = None) -> Tuple[float, Optional[Tuple[int, int]], bool]:
+    """
+    Scores the given (i, j) pairs of sorted_moves across the process pool.
+    Returns (best score, best pair, all shards reported) with the same tie-breaking
+    as the serial loop; that holds only when neither search runs into the deadline.
+    With a deadline, shards stop at it and shards still running
+    AI_PARALLEL_RESULT_GRACE_MS later are dropped, so the result is the best pair
+    among the shards that reported.
+    """
+    executor = get_executor()
+    shard_count = min(worker_count(), len(pairs))
+    snapshot = SearchSnapshot(game)
+    sim_player = player.copy()
+    actions = [_strip_action(a) for a in sorted_moves]
+    ranked = [(rank, i, j) for rank, (i, j) in enumerate(pairs)]
+    futures = [executor.submit(_evaluate_pair_shard, snapshot, sim_player, actions, ranked[k::shard_count], deadline) for k in range(shard_count)]
+
+    timeout = None
+    if deadline is not None:
+        timeout = max(0.0, deadline - time.monotonic()) + C.AI_PARALLEL_RESULT_GRACE_MS / 1000.0
+    done, not_done = wait(futures, timeout=timeout)
+    for future in not_done: future.cancel()
+    if not_done and C.DEBUG_MODE: print(f"  ({len(not_done)}/{shard_count} combo shards missed the deadline)")
+
+    best_score, best_rank = -1.0, -1
+    for future in futures:
+        if future not in done: continue
+        score, rank = future.result()
+        if rank < 0: continue
+        if score > best_score or (score == best_score and rank < best_rank):
+            best_score, best_rank = score, rank
+    if best_rank < 0: return best_score, None, not not_done
+    return best_score, pairs[best_rank], not not_done
+
+def _run_mcts_shard(snapshot: SearchSnapshot, player_index: int, arms: List[List[Tuple[str, Dict[str, Any], float]]], deadline: Optional[float], seed: int) -> Tuple[List[int], List[float]]:
+    """Worker entry point: one independent MCTS search over the root plans."""
+    from .ai_strategy import MCTSStrategy
+    strategy = MCTSStrategy()
+    strategy.deadline = deadline
+    plans = [[PotentialAction(action_type=t, details=d, score=s, command_generator=None) for t, d, s in arm] for arm in arms]
+    return strategy._run_mcts(snapshot, snapshot.players[player_index], plans, random.Random(seed))
+
+def run_mcts_in_parallel(game: 'Game', player: 'Player', arms: List[List['PotentialAction']], deadline: Optional[float]) -> Tuple[List[int], List[float]]:
+    """
+    Root-parallel MCTS: every worker searches the same root plans with its own seed
+    until the parent's deadline (time.monotonic(), shared by all processes); visits
+    and total rewards are summed per plan. Pool start-up and pickling the snapshot
+    come out of the same budget, and workers still running
+    AI_PARALLEL_RESULT_GRACE_MS past the deadline are left out.
+    """
+    executor = get_executor()
+    snapshot = SearchSnapshot(game, with_players=True)
+    player_index = game.players.index(player)
+    stripped = [[_strip_action(a) for a in arm] for arm in arms]
+    futures = [executor.submit(_run_mcts_shard, snapshot, player_index, stripped, deadline, random.getrandbits(32))
+               for _ in range(worker_count())]
+
+    timeout = None
+    if deadline is not None:
+        timeout = max(0.0, deadline - time.monotonic()) + C.AI_PARALLEL_RESULT_GRACE_MS / 1000.0
+    done, not_done = wait(futures, timeout=timeout)
+    for future in not_done: future.cancel()
+    if not_done and C.DEBUG_MODE: print(f"  ({len(not_done)}/{len(futures)} MCTS workers missed the deadline)")
+
+    visits, totals = [0] * len(arms), [0.0] * len(arms)
+    for future in futures:
+        if future not in done: continue
+        shard_visits, shard_totals = future.result()
+        for k in range(len(arms)):
+            visits[k] += shard_visits[k]
+            totals[k] += shard_totals[k]
+    return visits, totals
@@ -2,7 +2,10 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional, TYPE_CHECKING, Tuple, Set
-from collections import Counter
+from collections import Counter, OrderedDict
+import math
+import random
+import time
 import pygame
 
 if TYPE_CHECKING:
@@ -10,14 +13,131 @@ if TYPE_CHECKING:
     from .player import Player, AIPlayer, RouteStep
     from .tile import TileType
 
-from .enums import Direction
+from .enums import Direction, PlayerState
 from .tile import PlacedTile
+from .board import STATIC_PLAYABLE, STATIC_BUILDING
 from common.constants import KING_AI_TREE_TILE_BIAS, MAX_TARGETS_FOR_COMBO_SEARCH
+import common.constants as C
 from .ai_actions import PotentialAction
 from .commands import PlaceTileCommand, ExchangeTileCommand
 
+class TranspositionTable:
+    """
+    Bounded LRU map from a simulated state's hash to its board score. One table is
+    shared by every strategy that plans during a single AI turn, so a state reached
+    through different action orders or strategies is scored once. _score_move keeps
+    its per-move scores here too, under ('move', ...) keys.
+    """
+    def __init__(self, max_entries: int = C.AI_TRANSPOSITION_TABLE_SIZE):
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def state_key(game: Game, player: Player) -> Tuple[int, int]:
+        """
+        Key of the scored state: the board's Zobrist hash (cells and stop ownership) plus
+        the player whose cards drive the route term. _score_board_state does not read the
+        hand, so it is not part of the key. Mod-side scores are added outside it.
+        """
+        return (game.board.zobrist, player.player_id)
+
+    def lookup(self, key) -> Optional[float]:
+        score = self.entries.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return score
+
+    def store(self, key, score: float):
+        self.entries[key] = score
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
 class AIStrategy(ABC):
     """Abstract base class for all AI difficulty levels (brains)."""
+    # time.monotonic() value after which searches wrap up with their best plan so far.
+    deadline: Optional[float] = None
+    # Per-turn TranspositionTable set by AIPlayer while it plans (None = no sharing).
+    transposition_table: Optional[TranspositionTable] = None
+    # Last ideal plan seen by _score_move and its coord -> step index map.
+    _ideal_plan_ref: Optional[List[RouteStep]] = None
+    _ideal_plan_index: Dict[Tuple[int, int], int] = {}
+
+    def __getstate__(self):
+        # Strategies travel to worker processes with their players; the per-turn
+        # search state stays behind.
+        state = self.__dict__.copy()
+        state.pop('transposition_table', None)
+        state.pop('deadline', None)
+        return state
+
+    def start_turn_clock(self, budget_ms: Optional[float]):
+        """Starts (or with None, clears) the thinking deadline for the current turn."""
+        self.deadline = time.monotonic() + budget_ms / 1000.0 if budget_ms else None
+
+    def _time_is_up(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def _search_plans_best_first(self, plans: List[List[PotentialAction]], score_plan, bound_plan=None, group_of=None) -> Tuple[float, Optional[List[PotentialAction]]]:
+        """
+        Scores candidate plans and returns (best score, best plan). score_plan returns
+        None for an invalid plan. bound_plan, if given, returns an admissible upper
+        bound on a plan's score: plans are then tried in order of that bound and the
+        search stops (branch-and-bound) once no remaining plan can beat the best.
+        group_of, used with bound_plan, maps a plan to a key (e.g. its first action):
+        plans sharing a key are tried back to back, groups in order of their best
+        bound, and the rest of a group is skipped once its bounds fall below the best.
+        With a deadline set, plans are tried best-first (by bound, then by summed
+        move scores) and the search stops once time is up and a valid plan is in hand.
+        Ties always go to the earliest plan in the given order, so a search that
+        completes picks the same plan as a plain in-order scan.
+        """
+        order = range(len(plans))
+        bounds = groups = None
+        # Under a deadline the move-score estimate decides which plans get scored first.
+        estimates = [sum(a.score for a in plan) for plan in plans] if self.deadline is not None else [0.0] * len(plans)
+        if bound_plan is not None:
+            bounds = [bound_plan(plan) for plan in plans]
+            if group_of is not None:
+                groups = [group_of(plan) for plan in plans]
+                group_bound, group_first = {}, {}
+                for k, key in enumerate(groups):
+                    if key not in group_bound: group_bound[key], group_first[key] = bounds[k], k
+                    elif bounds[k] > group_bound[key]: group_bound[key] = bounds[k]
+                order = sorted(order, key=lambda k: (-group_bound[groups[k]], group_first[groups[k]], -bounds[k], -estimates[k], k))
+            else:
+                order = sorted(order, key=lambda k: (-bounds[k], -estimates[k], k))
+        elif self.deadline is not None:
+            order = sorted(order, key=lambda k: (-estimates[k], k))
+        best_score, best_rank = -1.0, -1
+        pruned_group = None
+        for evaluated, k in enumerate(order):
+            if bounds is not None and best_rank >= 0:
+                if groups is not None and groups[k] == pruned_group: continue
+                if bounds[k] < best_score:
+                    # Groups are ordered by their best bound, so a group whose first
+                    # plan cannot beat the best ends the search.
+                    if groups is None or bounds[k] == group_bound[groups[k]]:
+                        if C.DEBUG_MODE: print(f"  (Bound pruned {len(plans) - evaluated}/{len(plans)} plans)")
+                        break
+                    pruned_group = groups[k]
+                    continue
+                if bounds[k] == best_score and k > best_rank: continue
+            if best_rank >= 0 and self._time_is_up():
+                print(f"  (Time budget reached after {evaluated}/{len(plans)} plans; keeping best so far)")
+                break
+            score = score_plan(plans[k])
+            if score is None: continue
+            if score > best_score or (score == best_score and k < best_rank):
+                best_score, best_rank = score, k
+        return best_score, (plans[best_rank] if best_rank >= 0 else None)
+
     @abstractmethod
     def plan_turn(self, game: Game, player: AIPlayer) -> List[PotentialAction]:
         """Analyzes the game state and returns a list of planned actions."""
@@ -30,21 +150,25 @@ class AIStrategy(ABC):
         if stops is None: return None
         t1, t2 = game.get_terminal_coords(player.line_card.line_number)
         if not t1 or not t2: return None
-        path1, cost1 = game.pathfinder.find_path(game, player, [t1] + stops + [t2], is_hypothetical=True)
-        path2, cost2 = game.pathfinder.find_path(game, player, [t2] + stops + [t1], is_hypothetical=True)
-        if cost1 == float('inf') and cost2 == float('inf'): return None
-        return path1 if cost1 <= cost2 else path2
+        path, cost = game.pathfinder.find_best_route(game, player, t1, t2, stops, is_hypothetical=True)
+        if cost == float('inf'): return None
+        return path
         
     def _gather_standard_actions(self, game: Game, player: AIPlayer, ideal_plan, target_squares: Set[Tuple[int, int]]) -> List[PotentialAction]:
         """Gathers all standard place/exchange moves for a given set of targets."""
         actions = []
         rule_engine = game.rule_engine
         unique_hand_tiles = list(set(player.hand))
+        coords = list(target_squares)
+        # Legality of every (square, tile, orientation) in one batch, as orientation bitmasks.
+        placement_masks = rule_engine.get_placement_masks(game, unique_hand_tiles, coords)
+        exchange_masks = rule_engine.get_exchange_masks(game, player, unique_hand_tiles, coords)
 
-        for r, c in target_squares:
-            for tile in unique_hand_tiles:
-                for o in [0, 90, 180, 270]:
-                    if rule_engine.check_placement_validity(game, tile, o, r, c)[0]:
+        for k, (r, c) in enumerate(coords):
+            if actions and self._time_is_up(): break
+            for t, tile in enumerate(unique_hand_tiles):
+                for steps, o in enumerate([0, 90, 180, 270]):
+                    if (placement_masks[k][t] >> steps) & 1:
                         score, breakdown = self._score_move(game, player, ideal_plan, 'place', tile, o, r, c)
                         actions.append(PotentialAction(
                             action_type='place',
@@ -52,7 +176,7 @@ class AIStrategy(ABC):
                             score=score, score_breakdown=breakdown,
                             command_generator=lambda g, p, t=tile, orient=o, row=r, col=c: PlaceTileCommand(g, p, t, orient, row, col)
                         ))
-                    if game.board.get_tile(r,c) and rule_engine.check_exchange_validity(game, player, tile, o, r, c)[0]:
+                    if (exchange_masks[k][t] >> steps) & 1:
                         score, breakdown = self._score_move(game, player, ideal_plan, 'exchange', tile, o, r, c)
                         actions.append(PotentialAction(
                             action_type='exchange',
@@ -62,22 +186,45 @@ class AIStrategy(ABC):
                         ))
         return actions
 
+    def _ideal_step_index(self, ideal_plan: Optional[List[RouteStep]]) -> Dict[Tuple[int, int], int]:
+        """coord -> index of its first step in ideal_plan, rebuilt only when the plan changes."""
+        if not ideal_plan: return {}
+        if self._ideal_plan_ref is not ideal_plan:
+            index: Dict[Tuple[int, int], int] = {}
+            for i, step in enumerate(ideal_plan):
+                index.setdefault(step.coord, i)
+            self._ideal_plan_ref, self._ideal_plan_index = ideal_plan, index
+        return self._ideal_plan_index
+
     def _score_move(self, game: 'Game', player: 'Player', ideal_plan: Optional[List[RouteStep]], move_type: str, tile: TileType, orientation: int, r: int, c: int) -> Tuple[float, Dict[str, float]]:
-        """Scores a single potential move."""
+        """
+        Scores a single potential move. While a turn's transposition table is set,
+        scores are memoized under the board's Zobrist hash, so re-gathering the same
+        candidates on an unchanged board (or one restored by unmake) is a lookup.
+        """
+        step_index = self._ideal_step_index(ideal_plan).get((r, c))
+        table = self.transposition_table
+        if table is None:
+            return self._compute_move_score(game, player, step_index, move_type, tile, orientation, r, c)
+        key = ('move', game.board.zobrist, player.player_id, step_index, move_type, tile, orientation, r, c)
+        cached = table.lookup(key)
+        if cached is None:
+            cached = self._compute_move_score(game, player, step_index, move_type, tile, orientation, r, c)
+            table.store(key, cached)
+        return cached[0], dict(cached[1])
+
+    def _compute_move_score(self, game: 'Game', player: 'Player', step_index: Optional[int], move_type: str, tile: TileType, orientation: int, r: int, c: int) -> Tuple[float, Dict[str, float]]:
         score, breakdown = 1.0, {'base': 1.0}
-        if ideal_plan:
-            for i, step in enumerate(ideal_plan):
-                if step.coord == (r, c):
-                    score += 200.0 - (i * 5)
-                    breakdown['ideal_path'] = 200.0 - (i * 5)
-                    break
+        if step_index is not None:
+            score += 200.0 - (step_index * 5)
+            breakdown['ideal_path'] = 200.0 - (step_index * 5)
         if player.route_card:
             for d in Direction:
                 b_id = game.board.get_building_at(r + d.value[0], c + d.value[1])
                 if b_id and b_id in player.route_card.stops and b_id not in game.board.buildings_with_stops:
                     conns = game.rule_engine.get_effective_connections(tile, orientation)
-                    is_parallel = (d in [Direction.N, Direction.S] and 'S' in conns.get('N',[])) or \
-                                  (d in [Direction.E, Direction.W] and 'W' in conns.get('E',[]))
+                    is_parallel = (d in [Direction.N, Direction.S] and 'S' in conns['N']) or \
+                                  (d in [Direction.E, Direction.W] and 'W' in conns['E'])
                     if is_parallel:
                         score += 150.0
                         breakdown['stop_creation'] = 150.0
@@ -93,36 +240,162 @@ class AIStrategy(ABC):
         
     def _apply_potential_action_to_sim(self, sim_game, sim_player, action: PotentialAction):
         """Applies any PotentialAction to a simulated game state."""
+        self._make_action(sim_game, sim_player, action)
+
+    def _make_action(self, game: Game, player: Player, action: PotentialAction) -> List[tuple]:
+        """
+        Applies a PotentialAction in place (board and hand only, no prints, no action
+        count) and returns the undo delta for _unmake_action. Safe to use on the real
+        game as long as every make is paired with an unmake.
+        """
         d = action.details
-        if action.action_type == 'place':
-            sim_game.board.set_tile(d['coord'][0], d['coord'][1], PlacedTile(d['tile'], d['orientation']))
-            sim_player.hand.remove(d['tile'])
-        elif action.action_type == 'exchange':
-            old_tile = sim_game.board.get_tile(*d['coord'])
-            sim_game.board.set_tile(d['coord'][0], d['coord'][1], PlacedTile(d['tile'], d['orientation']))
-            sim_player.hand.remove(d['tile'])
-            if old_tile: sim_player.hand.append(old_tile.tile_type)
+        delta = []
+        if action.action_type in ('place', 'exchange'):
+            r, c = d['coord']
+            old_tile = game.board.get_tile(r, c)
+            delta.append(('tile', r, c, old_tile))
+            game.board.set_tile(r, c, PlacedTile(d['tile'], d['orientation']))
+            idx = player.hand.index(d['tile'])
+            del player.hand[idx]
+            delta.append(('hand_removed', idx, d['tile']))
+            if action.action_type == 'exchange' and old_tile:
+                player.hand.append(old_tile.tile_type)
+                delta.append(('hand_appended',))
         elif action.action_type == 'sell_tile':
-            if d['tile'] in sim_player.hand: sim_player.hand.remove(d['tile'])
+            if d['tile'] in player.hand:
+                idx = player.hand.index(d['tile'])
+                del player.hand[idx]
+                delta.append(('hand_removed', idx, d['tile']))
         elif action.action_type == 'priority_requisition':
-            sim_player.hand.append(sim_game.tile_types['Curve'])
+            player.hand.append(game.tile_types['Curve'])
+            delta.append(('hand_appended',))
+        return delta
+
+    def _unmake_action(self, game: Game, player: Player, delta: List[tuple]):
+        """Reverts a delta returned by _make_action, restoring the exact prior state."""
+        for entry in reversed(delta):
+            kind = entry[0]
+            if kind == 'tile':
+                _, r, c, old_tile = entry
+                game.board.set_tile(r, c, old_tile)
+            elif kind == 'hand_removed':
+                player.hand.insert(entry[1], entry[2])
+            elif kind == 'hand_appended':
+                player.hand.pop()
 
     def _score_board_state(self, game: Game, player: Player) -> float:
         """Scores the overall quality of the board from the AI's perspective."""
+        table = self.transposition_table
+        if table is None:
+            return self._score_route(game, player) + self._score_local_board(game)
+        key = table.state_key(game, player)
+        score = table.lookup(key)
+        if score is None:
+            score = self._score_route(game, player) + self._score_local_board(game)
+            table.store(key, score)
+        return score
+
+    def _score_route(self, game: Game, player: Player) -> float:
+        """Route part of _score_board_state: tiled steps of the ideal route and its stops."""
         score = 0.0
+        # A goal square that can never hold track means there is no ideal route; skip the search.
+        if self._route_sequence(game, player) is None: return score
+        # Not incremental: the legs share arrival-side state, so the route is searched
+        # whole. find_best_route reuses a RouteCache entry while none of the cells the
+        # last search read has changed, so only plans touching the route's area re-search.
         ideal_plan = self._calculate_ideal_route(game, player)
         if ideal_plan:
             for i, step in enumerate(ideal_plan):
                 if tile := game.board.get_tile(step.coord[0], step.coord[1]):
                     score += 100.0 - (i * 2)
                     if step.is_goal_node and tile.has_stop_sign: score += 200.0
-        for r in range(game.board.rows):
-            for c in range(game.board.cols):
-                if tile := game.board.get_tile(r, c):
-                    score += sum(5.0 for d in Direction if game.board.get_tile(r + d.value[0], c + d.value[1]))
-                    if tile.tile_type.name.startswith("Tree"): score += 50.0
         return score
 
+    def _score_local_board(self, game: Game) -> float:
+        """
+        Tile part of _score_board_state: 5 per occupied neighbour of each tile, 50 per
+        Tree tile. Read from the board's running totals, so it costs O(1) per plan.
+        """
+        return 10.0 * game.board.tile_links + 50.0 * game.board.tree_tiles
+
+    def _route_sequence(self, game: Game, player: Player) -> Optional[List[Tuple[int, int]]]:
+        """
+        The goal squares (terminal, stops..., terminal) the ideal route must visit, or
+        None if no ideal route can exist: missing cards or terminals, or a goal square
+        that can never carry track (a building or wall).
+        """
+        if not player.line_card or not player.route_card: return None
+        stops = player.get_hypothetical_stop_coords(game)
+        terminals = game.get_terminal_coords(player.line_card.line_number)
+        if stops is None or not terminals or not terminals[0] or not terminals[1]: return None
+        sequence = [terminals[0]] + stops + [terminals[1]]
+        board = game.board
+        for r, c in sequence:
+            if not board.get_cell(r, c) and board.get_static(r, c) & (STATIC_PLAYABLE | STATIC_BUILDING) != STATIC_PLAYABLE:
+                return None
+        return sequence
+
+    def _route_score_bound(self, game: Game, player: Player, placements: Optional[int] = C.MAX_PLAYER_ACTIONS) -> float:
+        """
+        Admissible upper bound on _score_route for any board reachable with at most
+        `placements` more tiles (None = any number, e.g. over several turns).
+        The pathfinder only walks tiled squares, so a route of L steps scores
+        sum(100 - 2i) = L * (101 - L) for its steps, and L is at least one more than the
+        Manhattan length of its legs. On top come 200 per visit of a goal square with a
+        stop sign: only goal squares that have one, or can still get one (next to a
+        building without a stop, at most one per placement), and each of them at most
+        once per (arrival side, goal index) search state.
+        """
+        sequence = self._route_sequence(game, player)
+        if sequence is None: return 0.0
+        min_steps = 1 + sum(abs(a[0] - b[0]) + abs(a[1] - b[1]) for a, b in zip(sequence, sequence[1:]))
+        board = game.board
+        signed = gainable = 0
+        for r, c in set(sequence):
+            tile = board.get_tile(r, c)
+            if tile and tile.has_stop_sign:
+                signed += 1
+            elif any((building := board.coord_to_building.get((r + d.value[0], c + d.value[1]))) and building not in board.buildings_with_stops for d in Direction):
+                gainable += 1
+        if placements is not None: gainable = min(gainable, placements)
+        goal_visits = (signed + gainable) * 4 * len(sequence)
+        # L * (101 - L) + 200 * min(L, goal_visits) is concave in L: its maximum over
+        # L >= min_steps is at min_steps or at one of the unconstrained peaks above it.
+        lengths = [min_steps] + [L for L in (50, 51, 150, 151, goal_visits, goal_visits + 1) if L > min_steps]
+        return float(max(L * (101 - L) + 200 * min(L, goal_visits) for L in lengths))
+
+    def _local_score_delta(self, game: Game, action: PotentialAction) -> float:
+        """Exact change of _score_local_board from applying one action to the current board."""
+        if action.action_type not in ('place', 'exchange'): return 0.0
+        r, c = action.details['coord']
+        delta = 50.0 if action.details['tile'].name.startswith("Tree") else 0.0
+        old_tile = game.board.get_tile(r, c)
+        if old_tile:
+            if old_tile.tile_type.name.startswith("Tree"): delta -= 50.0
+        else:
+            # A new tile and each occupied neighbour see each other: 5 points both ways.
+            delta += sum(10.0 for d in Direction if game.board.get_tile(r + d.value[0], c + d.value[1]))
+        return delta
+
+    def _plan_score_bound(self, game: Game, plan: List[PotentialAction], local_score: float, route_bound: float, deltas: Dict[int, float]) -> float:
+        """
+        Upper bound on _score_board_state after a plan: the local part is exact
+        (per-action deltas plus 10 when two placements are adjacent), the route part
+        uses _route_score_bound. deltas caches _local_score_delta by id(action).
+        """
+        bound = local_score + route_bound
+        placed = []
+        for action in plan:
+            key = id(action)
+            if key not in deltas: deltas[key] = self._local_score_delta(game, action)
+            bound += deltas[key]
+            if action.action_type == 'place' and not game.board.get_tile(*action.details['coord']):
+                placed.append(action.details['coord'])
+        for i in range(len(placed)):
+            for j in range(i + 1, len(placed)):
+                if abs(placed[i][0] - placed[j][0]) + abs(placed[i][1] - placed[j][1]) == 1: bound += 10.0
+        return bound
+
 class GreedySequentialStrategy(AIStrategy):
     """
     A robust, greedy fallback strategy. It finds the best first move, simulates it,
@@ -171,27 +444,44 @@ class HardStrategy(AIStrategy):
         best_combo_score = -1.0; best_combo_plan = None
         if len(one_action_moves) >= 2:
             sorted_moves = sorted(one_action_moves, key=lambda a: a.score, reverse=True)
-            for i in range(len(sorted_moves)):
-                for j in range(i + 1, len(sorted_moves)):
-                    action1, action2 = sorted_moves[i], sorted_moves[j]
-                    if not self._is_combo_compatible(player, action1, action2): continue
-                    sim_game, sim_player = game.copy_for_simulation(), next(p for p in game.copy_for_simulation().players if p.player_id == player.player_id)
-                    self._apply_potential_action_to_sim(sim_game, sim_player, action1)
-                    details2 = action2.details
-                    is_valid2 = False
-                    if action2.action_type == 'place': is_valid2, _ = sim_game.rule_engine.check_placement_validity(sim_game, details2['tile'], details2['orientation'], *details2['coord'])
-                    elif action2.action_type == 'exchange': is_valid2, _ = sim_game.rule_engine.check_exchange_validity(sim_game, sim_player, details2['tile'], details2['orientation'], *details2['coord'])
-                    else: is_valid2 = True
-                    if not is_valid2: continue
-                    self._apply_potential_action_to_sim(sim_game, sim_player, action2)
-                    combo_score = self._score_board_state(sim_game, sim_player)
-                    if combo_score > best_combo_score: best_combo_score, best_combo_plan = combo_score, [action1, action2]
+            pairs = [(i, j) for i in range(len(sorted_moves)) for j in range(i + 1, len(sorted_moves))
+                     if self._is_combo_compatible(player, sorted_moves[i], sorted_moves[j])]
+            searched = False
+            if C.AI_PARALLEL_COMBO_SEARCH and len(pairs) >= C.AI_PARALLEL_MIN_PAIRS:
+                # Same pair as the serial search unless either one runs into the deadline.
+                from .ai_parallel import evaluate_pairs_in_parallel
+                best_combo_score, best_pair, searched = evaluate_pairs_in_parallel(game, player, sorted_moves, pairs, self.deadline)
+                if best_pair: best_combo_plan = [sorted_moves[best_pair[0]], sorted_moves[best_pair[1]]]
+            if not searched and best_combo_plan is None:
+                # Serial search; also the fallback when the parallel shards missed the deadline empty-handed.
+                plans = [[sorted_moves[i], sorted_moves[j]] for i, j in pairs]
+                local_score, route_bound, deltas = self._score_local_board(game), self._route_score_bound(game, player), {}
+                best_combo_score, best_combo_plan = self._search_plans_best_first(
+                    plans, lambda plan: self._score_combo(game, player, plan[0], plan[1]),
+                    bound_plan=lambda plan: self._plan_score_bound(game, plan, local_score, route_bound, deltas))
         if best_combo_plan:
             print(f"  (HardStrategy: Found a valid combo plan with score {best_combo_score:.2f})")
             return best_combo_plan
         print("  (HardStrategy: No valid 2-action plan found.)")
         return []
 
+    def _score_combo(self, game: Game, player: Player, action1: PotentialAction, action2: PotentialAction) -> Optional[float]:
+        """Scores the board after both actions via make/unmake, or None if action2 becomes invalid."""
+        delta1 = self._make_action(game, player, action1)
+        try:
+            details2 = action2.details
+            is_valid2 = False
+            if action2.action_type == 'place': is_valid2, _ = game.rule_engine.check_placement_validity(game, details2['tile'], details2['orientation'], *details2['coord'])
+            elif action2.action_type == 'exchange': is_valid2, _ = game.rule_engine.check_exchange_validity(game, player, details2['tile'], details2['orientation'], *details2['coord'])
+            else: is_valid2 = True
+            if not is_valid2: return None
+            delta2 = self._make_action(game, player, action2)
+            combo_score = self._score_board_state(game, player)
+            self._unmake_action(game, player, delta2)
+            return combo_score
+        finally:
+            self._unmake_action(game, player, delta1)
+
     def _get_high_value_target_squares(self, game: Game, player: Player, ideal_plan: Optional[List[RouteStep]]) -> Set[Tuple[int, int]]:
         targets: Set[Tuple[int, int]] = set()
         if ideal_plan:
@@ -209,10 +499,8 @@ class HardStrategy(AIStrategy):
             for r_idx in range(game.board.rows):
                 for c_idx in range(game.board.cols):
                     if tile := game.board.get_tile(r_idx, c_idx):
-                        conns = game.rule_engine.get_effective_connections(tile.tile_type, tile.orientation)
-                        all_exits = {exit_dir for exits in conns.values() for exit_dir in exits}
-                        for exit_dir_str in all_exits:
-                            exit_dir = Direction.from_str(exit_dir_str)
+                        for exit_dir_str in game.rule_engine.get_connected_ports(tile.tile_type, tile.orientation):
+                            exit_dir = Direction[exit_dir_str]
                             nr, nc = r_idx + exit_dir.value[0], c_idx + exit_dir.value[1]
                             if game.board.is_playable_coordinate(nr, nc) and not game.board.get_tile(nr, nc): targets.add((nr, nc))
         print(f"  (HardStrategy identified {len(targets)} high-value squares)")
@@ -239,4 +527,330 @@ class HardStrategy(AIStrategy):
         player_hand_counts = Counter(player.hand)
         for tile, required_count in required_tiles.items():
             if player_hand_counts[tile] < required_count: return False
-        return True
\ No newline at end of file
+        return True
+
+    # --- Helpers shared by the lookahead strategies (KingStrategy, MCTSStrategy) ---
+
+    def _enumerate_combo_plans(self, game: Game, player: AIPlayer) -> List[List[PotentialAction]]:
+        """All compatible two-action plans over the (pruned) high-value squares, as HardStrategy builds them."""
+        ideal_plan = self._calculate_ideal_route(game, player)
+        target_squares = self._get_high_value_target_squares(game, player, ideal_plan)
+        if len(target_squares) > MAX_TARGETS_FOR_COMBO_SEARCH:
+            target_squares = self._prune_targets(game, player, target_squares, ideal_plan)
+        one_action_moves = self._gather_standard_actions(game, player, ideal_plan, target_squares)
+        sorted_moves = sorted(one_action_moves, key=lambda a: a.score, reverse=True)
+        return [[sorted_moves[i], sorted_moves[j]] for i in range(len(sorted_moves)) for j in range(i + 1, len(sorted_moves))
+                if self._is_combo_compatible(player, sorted_moves[i], sorted_moves[j])]
+
+    def _top_root_plans(self, game: Game, player: Player, plans: List[List[PotentialAction]], route_bound: float, limit: int) -> List[Tuple[float, int, List[PotentialAction]]]:
+        """The limit best plans by combo score as (score, index, plan), best first."""
+        local_score, deltas = self._score_local_board(game), {}
+        bounds = [self._plan_score_bound(game, plan, local_score, route_bound, deltas) for plan in plans]
+        top: List[Tuple[float, int, List[PotentialAction]]] = []
+        for k in sorted(range(len(plans)), key=lambda k: -bounds[k]):
+            if len(top) >= limit and bounds[k] < top[-1][0]: break
+            if top and self._time_is_up(): break
+            score = self._score_combo(game, player, plans[k][0], plans[k][1])
+            if score is None: continue
+            top.append((score, k, plans[k]))
+            top.sort(key=lambda entry: (-entry[0], entry[1]))
+            del top[limit:]
+        return top
+
+    def _reply_targets(self, game: Game, player: Player, limit: int = C.KING_AI_REPLY_TARGETS) -> Set[Tuple[int, int]]:
+        """
+        Quiet, small target set for inner plies: empty squares next to the player's
+        unstopped route buildings, else the board frontier nearest to them (or to the
+        centre), capped at limit squares.
+        """
+        board = game.board
+        anchors = []
+        if player.route_card:
+            anchors = [board.building_coords[b] for b in player.route_card.stops
+                       if b not in board.buildings_with_stops and b in board.building_coords]
+        targets = set()
+        for br, bc in anchors:
+            for d in Direction:
+                nr, nc = br + d.value[0], bc + d.value[1]
+                if board.is_playable_coordinate(nr, nc) and not board.get_tile(nr, nc): targets.add((nr, nc))
+        if not targets:
+            targets = {divmod(idx, board.cols) for idx in board.get_move_index()[0]}
+        if not anchors: anchors = [(board.rows // 2, board.cols // 2)]
+        nearest = sorted(targets, key=lambda rc: (min(abs(rc[0] - a[0]) + abs(rc[1] - a[1]) for a in anchors), rc))
+        return set(nearest[:limit])
+
+    def _draw_distribution(self, game: Game, player: Player, samples: Optional[int] = None) -> List[Tuple[float, TileType]]:
+        """
+        The `samples` most likely (all if None) tile types for player's next draw, with
+        probabilities renormalised over them. Mirrors DeckManager.draw_tile's king Tree bias.
+        """
+        pile = game.deck_manager.tile_draw_pile
+        counts = pile.counts
+        if not counts: return [(1.0, pile.bottom[-1])] if pile.bottom else []
+        biased = getattr(player, 'difficulty_mode', None) == 'king' and any(t.name.startswith("Tree") for t in counts)
+        weights = {t: n * (KING_AI_TREE_TILE_BIAS if biased and t.name.startswith("Tree") else 1) for t, n in counts.items()}
+        likely = sorted(weights.items(), key=lambda item: (-item[1], item[0].name))[:samples]
+        total = sum(w for _, w in likely)
+        return [(w / total, t) for t, w in likely]
+
+
+class KingStrategy(HardStrategy):
+    """
+    The "king" opponent: a multi-ply expectimax search on top of HardStrategy's combos.
+    Plies follow turn order. Opponents are modelled as playing their best-scoring
+    single move; the AI's own later turns are chance nodes over the tile it draws
+    (weighted by the draw pile, including the king Tree bias) followed by its best
+    single reply. Depths are searched by iterative deepening inside the turn's time
+    budget, with star2-style windows at chance nodes and bound cutoffs at max nodes.
+    Every node takes an alpha and returns its exact value when that is above alpha,
+    otherwise an upper bound on it that is at most alpha.
+    """
+    # Most a single action can add to _score_local_board: 4 occupied neighbours (10
+    # each, counted both ways) plus the Tree bonus.
+    MAX_LOCAL_GAIN_PER_PLY = 90.0
+
+    def plan_turn(self, game: Game, player: AIPlayer) -> List[PotentialAction]:
+        print(f"  (KingStrategy starting... Analyzing options)")
+        plans = self._enumerate_combo_plans(game, player)
+        # Later plies place more tiles, so the route bound must not assume this turn's two.
+        route_bound = self._route_score_bound(game, player, placements=None)
+        candidates = self._top_root_plans(game, player, plans, route_bound, C.KING_AI_ROOT_PLANS)
+        if not candidates:
+            print("  (KingStrategy: No valid 2-action plan found.)")
+            return []
+
+        # Depth 1 is the plain combo score; each further depth adds one player's turn.
+        values = {index: score for score, index, _ in candidates}
+        best_index = candidates[0][1]
+        ply_order = self._ply_order(game, player)
+        for depth in range(2, C.KING_AI_SEARCH_PLIES + 1):
+            depth_values, alpha, depth_best = {}, float('-inf'), None
+            for _, index, plan in sorted(candidates, key=lambda cand: (-values[cand[1]], cand[1])):
+                if self._time_is_up(): break
+                deltas = [self._make_action(game, player, action) for action in plan]
+                try:
+                    value = self._expectimax(game, player, ply_order[:depth - 1], alpha, route_bound)
+                finally:
+                    for delta in reversed(deltas):
+                        self._unmake_action(game, player, delta)
+                depth_values[index] = value
+                if value > alpha: alpha, depth_best = value, index
+            # Plies cut short by the deadline return static scores, so a depth that ran
+            # into the deadline is not trusted even if every root plan got a value.
+            if len(depth_values) < len(candidates) or self._time_is_up():
+                print(f"  (KingStrategy: Time budget reached during depth {depth}; keeping depth {depth - 1})")
+                break
+            values, best_index = depth_values, depth_best
+            print(f"  (KingStrategy: Depth {depth} complete, best expected score {alpha:.2f})")
+
+        best_plan = plans[best_index]
+        print(f"  (KingStrategy: Chose plan with score {values[best_index]:.2f})")
+        return best_plan
+
+    def _ply_order(self, game: Game, player: Player) -> List[Player]:
+        """The next KING_AI_SEARCH_PLIES - 1 turns: players still laying track, in turn order."""
+        order: List[Player] = []
+        start, n = game.players.index(player), len(game.players)
+        k = 1
+        while len(order) < C.KING_AI_SEARCH_PLIES - 1:
+            mover = game.players[(start + k) % n]
+            if mover is player or mover.player_state == PlayerState.LAYING_TRACK: order.append(mover)
+            k += 1
+        return order
+
+    def _expectimax(self, game: Game, player: Player, plies: List[Player], alpha: float, route_bound: float) -> float:
+        """Value of the current (simulated) board for player after the given turns are played."""
+        if not plies or self._time_is_up():
+            return self._score_board_state(game, player)
+        mover = plies[0]
+        if mover is player:
+            return self._draw_chance_node(game, player, plies, alpha, route_bound)
+        move = self._likely_move(game, mover)
+        if move is None:
+            return self._expectimax(game, player, plies[1:], alpha, route_bound)
+        delta = self._make_action(game, mover, move)
+        try:
+            return self._expectimax(game, player, plies[1:], alpha, route_bound)
+        finally:
+            self._unmake_action(game, mover, delta)
+
+    def _draw_chance_node(self, game: Game, player: Player, plies: List[Player], alpha: float, route_bound: float) -> float:
+        """
+        Expected value of our next turn over the tile drawn before it. Each draw is
+        searched with the alpha it has to beat for the whole node to beat alpha, given
+        the draws already searched and `upper` for the ones still to come.
+        """
+        outcomes = self._draw_distribution(game, player, C.KING_AI_DRAW_SAMPLES)
+        if not outcomes or len(player.hand) >= C.HAND_TILE_LIMIT:
+            return self._best_reply(game, player, plies, alpha, route_bound)
+        upper = self._score_local_board(game) + self.MAX_LOCAL_GAIN_PER_PLY * len(plies) + route_bound
+        expected, remaining = 0.0, 1.0
+        for probability, tile in outcomes:
+            # Even if every remaining draw reached the upper bound, this node cannot beat alpha.
+            if expected + remaining * upper <= alpha:
+                return expected + remaining * upper
+            child_alpha = (alpha - expected - (remaining - probability) * upper) / probability
+            player.hand.append(tile)
+            try:
+                value = self._best_reply(game, player, plies, child_alpha, route_bound)
+            finally:
+                player.hand.pop()
+            expected += probability * value
+            remaining -= probability
+        return expected
+
+    def _best_reply(self, game: Game, player: Player, plies: List[Player], alpha: float, route_bound: float) -> float:
+        """Max node: our best single move on a later turn, followed by the remaining plies."""
+        moves = self._gather_standard_actions(game, player, None, self._reply_targets(game, player))
+        if not moves:
+            return self._expectimax(game, player, plies[1:], alpha, route_bound)
+        local_score = self._score_local_board(game)
+        rest_gain = self.MAX_LOCAL_GAIN_PER_PLY * (len(plies) - 1) + route_bound
+        best = float('-inf')
+        for move in sorted(moves, key=lambda a: a.score, reverse=True):
+            if best > float('-inf') and self._time_is_up(): break
+            if local_score + self._local_score_delta(game, move) + rest_gain <= best: continue
+            delta = self._make_action(game, player, move)
+            try:
+                best = max(best, self._expectimax(game, player, plies[1:], max(alpha, best), route_bound))
+            finally:
+                self._unmake_action(game, player, delta)
+        return best
+
+    def _likely_move(self, game: Game, mover: Player) -> Optional[PotentialAction]:
+        """Opponent model: the single move the mover's own move scoring likes best."""
+        moves = self._gather_standard_actions(game, mover, None, self._reply_targets(game, mover))
+        return max(moves, key=lambda a: a.score) if moves else None
+
+
+class MCTSStrategy(HardStrategy):
+    """
+    Monte Carlo search over HardStrategy's best MCTS_ROOT_PLANS combos. Each playout
+    applies one root plan, then plays MCTS_ROLLOUT_TURNS further turns headlessly:
+    movers draw from the draw pile's distribution and make epsilon-greedy single
+    moves (with stop signs), and the playout is rewarded with the AI's board score
+    plus MCTS_ROUTE_BONUS if its route can be completed. Root plans are chosen by
+    UCB1 and the most visited one is played. Independent searches can run in worker
+    processes (root parallelisation) and have their statistics summed.
+    """
+
+    def plan_turn(self, game: Game, player: AIPlayer) -> List[PotentialAction]:
+        print(f"  (MCTSStrategy starting... Analyzing options)")
+        plans = self._enumerate_combo_plans(game, player)
+        candidates = self._top_root_plans(game, player, plans, self._route_score_bound(game, player), C.MCTS_ROOT_PLANS)
+        if not candidates:
+            print("  (MCTSStrategy: No valid 2-action plan found.)")
+            return []
+        arms = [plan for _, _, plan in candidates]
+        if len(arms) == 1: return arms[0]
+
+        from .ai_parallel import worker_count, run_mcts_in_parallel
+        if C.MCTS_ROOT_PARALLEL and worker_count() > 1:
+            visits, totals = run_mcts_in_parallel(game, player, arms, self.deadline)
+        else:
+            visits, totals = self._run_mcts(game, player, arms, random.Random())
+
+        best = max(range(len(arms)), key=lambda k: (visits[k], totals[k] / visits[k] if visits[k] else 0.0, -k))
+        print(f"  (MCTSStrategy: {sum(visits)} playouts, chose plan {best} with {visits[best]} visits, mean reward {totals[best] / max(1, visits[best]):.2f})")
+        return arms[best]
+
+    def _run_mcts(self, game: Game, player: Player, arms: List[List[PotentialAction]], rng: random.Random) -> Tuple[List[int], List[float]]:
+        """Runs UCB1 playouts until the deadline (or MCTS_ITERATIONS) and returns (visits, total rewards) per arm."""
+        visits, totals = [0] * len(arms), [0.0] * len(arms)
+        low, high = float('inf'), float('-inf')
+        for iteration in range(C.MCTS_ITERATIONS):
+            if iteration >= len(arms) and self._time_is_up(): break
+            if iteration < len(arms):
+                arm = iteration
+            else:
+                # Rewards are normalised to [0, 1] over what has been seen so far.
+                spread = (high - low) or 1.0
+                log_n = math.log(iteration)
+                arm = max(range(len(arms)), key=lambda k: (totals[k] / visits[k] - low) / spread + C.MCTS_EXPLORATION * math.sqrt(log_n / visits[k]))
+            reward = self._playout(game, player, arms[arm], rng)
+            visits[arm] += 1
+            totals[arm] += reward
+            low, high = min(low, reward), max(high, reward)
+        return visits, totals
+
+    def _playout(self, game: Game, player: Player, plan: List[PotentialAction], rng: random.Random) -> float:
+        """One headless playout from the current board; every change is undone before returning."""
+        undo = []
+        try:
+            for action in plan:
+                undo.append((player, self._make_rollout_action(game, player, action)))
+            self._rollout_draws(game, player, rng, undo)
+            for mover in self._rollout_order(game, player):
+                for _ in range(C.MAX_PLAYER_ACTIONS):
+                    moves = self._gather_standard_actions(game, mover, None, self._reply_targets(game, mover))
+                    if not moves: break
+                    move = rng.choice(moves) if rng.random() < C.MCTS_RANDOM_MOVE_RATE else max(moves, key=lambda a: a.score)
+                    undo.append((mover, self._make_rollout_action(game, mover, move)))
+                self._rollout_draws(game, mover, rng, undo)
+            reward = self._score_board_state(game, player)
+            if self._route_is_complete(game, player): reward += C.MCTS_ROUTE_BONUS
+            return reward
+        finally:
+            for mover, delta in reversed(undo):
+                self._unmake_rollout_action(game, mover, delta)
+
+    def _rollout_order(self, game: Game, player: Player) -> List[Player]:
+        """The next MCTS_ROLLOUT_TURNS turns by players still laying track, in turn order."""
+        order: List[Player] = []
+        start, n = game.players.index(player), len(game.players)
+        k = 1
+        while len(order) < C.MCTS_ROLLOUT_TURNS:
+            mover = game.players[(start + k) % n]
+            if mover is player or mover.player_state == PlayerState.LAYING_TRACK: order.append(mover)
+            k += 1
+        return order
+
+    def _rollout_draws(self, game: Game, mover: Player, rng: random.Random, undo: List[tuple]):
+        """Refills mover's hand from the draw pile's distribution (the pile itself is left untouched)."""
+        outcomes = self._draw_distribution(game, mover)
+        while outcomes and len(mover.hand) < C.HAND_TILE_LIMIT:
+            mover.hand.append(rng.choices([t for _, t in outcomes], weights=[p for p, _ in outcomes], k=1)[0])
+            undo.append((mover, [('hand_appended',)]))
+
+    def _make_rollout_action(self, game: Game, player: Player, action: PotentialAction) -> List[tuple]:
+        """_make_action plus the stop sign a real placement would create, so routes can complete."""
+        delta = self._make_action(game, player, action)
+        if action.action_type in ('place', 'exchange'):
+            r, c = action.details['coord']
+            building_id = game.rule_engine.check_and_place_stop_sign(game, game.board.get_tile(r, c), r, c, announce=False)
+            if building_id: delta.append(('stop', r, c, building_id))
+        return delta
+
+    def _unmake_rollout_action(self, game: Game, player: Player, delta: List[tuple]):
+        for entry in reversed(delta):
+            if entry[0] == 'stop':
+                game.board.remove_stop_sign(entry[1], entry[2], entry[3])
+        self._unmake_action(game, player, [entry for entry in delta if entry[0] != 'stop'])
+
+    def _route_is_complete(self, game: Game, player: Player) -> bool:
+        """Whether player's track already forms a valid route, as Game.check_player_route_completion decides it."""
+        if not player.line_card or not player.route_card: return False
+        stops = player.get_required_stop_coords(game)
+        if stops is None: return False
+        terminals = game.get_terminal_coords(player.line_card.line_number)
+        if not terminals or not terminals[0] or not terminals[1]: return False
+        return game.pathfinder.find_best_route(game, player, terminals[0], terminals[1], stops)[1] != float('inf')
+
+
+STRATEGIES = {
+    'hard': HardStrategy,
+    'greedy': GreedySequentialStrategy,
+    'king': KingStrategy,
+    'mcts': MCTSStrategy,
+}
+
+def create_strategy(name: str) -> AIStrategy:
+    """Creates an AI strategy by name ('hard', 'greedy', 'king' or 'mcts')."""
+    try:
+        return STRATEGIES[name.lower()]()
+    except KeyError:
+        raise ValueError(f"Unknown AI strategy '{name}'. Choose from: {', '.join(STRATEGIES)}")
+
+def strategy_name(strategy: AIStrategy) -> str:
+    """Inverse of create_strategy, for saving."""
+    return next((name for name, cls in STRATEGIES.items() if type(strategy) is cls), 'hard')
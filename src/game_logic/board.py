@@ -1,10 +1,70 @@
 # game_logic/board.py
 from typing import List, Dict, Tuple, Optional, Set, Any
+import copy
+import itertools
+from array import array
 from .enums import Direction # Relative import
 from .tile import PlacedTile, TileType # Relative import
 # Import constants used *only* by Board
 from common.constants import GRID_ROWS, GRID_COLS, PLAYABLE_ROWS, PLAYABLE_COLS, BUILDING_COORDS, TERMINAL_DATA
 
+# --- Compact cell encoding ---
+# Each entry of Board.cells packs a placed tile into one integer:
+#   bits 0-3   exit mask (N, E, S, W -> 1, 2, 4, 8; see tile.PORT_BITS)
+#   bits 4-19  entry->exit adjacency (4 bits of exit mask per entry side)
+#   bit 20     cell is occupied
+#   bit 21     tile carries a stop sign
+#   bit 22     tile is a terminal
+CELL_PORT_MASK = 0xF
+CELL_ADJACENCY_SHIFT = 4
+CELL_OCCUPIED = 1 << 20
+CELL_STOP = 1 << 21
+CELL_TERMINAL = 1 << 22
+
+# Board versions are drawn from one global counter, so a version number identifies a
+# single board content even across Board.copy() snapshots.
+_board_versions = itertools.count(1)
+
+# Zobrist hashing: Board.zobrist is the XOR of zobrist_key(idx, cell value) over all
+# occupied cells, plus zobrist_key(idx, ZOBRIST_STOP_OWNER | building ordinal) for
+# each stop sign, since the cell value alone does not say which building owns a stop.
+# Keys come from a fixed 64-bit mixer, so equal boards hash equally in every process
+# without a shared random table.
+ZOBRIST_MASK = (1 << 64) - 1
+# Above every CELL_* bit, so stop-owner keys never collide with cell values.
+ZOBRIST_STOP_OWNER = 1 << 23
+_zobrist_keys: Dict[Tuple[int, int], int] = {}
+
+def zobrist_key(idx: int, value: int) -> int:
+    """64-bit key of one (cell index, cell value) pair; 0 for an empty cell."""
+    if not value: return 0
+    key = _zobrist_keys.get((idx, value))
+    if key is None:
+        # splitmix64 finaliser over the packed pair
+        z = ((idx << 24 | value) + 0x9E3779B97F4A7C15) & ZOBRIST_MASK
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & ZOBRIST_MASK
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & ZOBRIST_MASK
+        key = _zobrist_keys[(idx, value)] = z ^ (z >> 31)
+    return key
+
+# Each entry of Board.static_cells holds the level's fixed layout flags.
+STATIC_PLAYABLE = 1
+STATIC_BUILDING = 2
+
+def encode_tile_type(tile_type: TileType, orientation: int) -> int:
+    """Packs a tile type at an orientation into a cell value without stop/terminal flags."""
+    steps = (orientation % 360) // 90
+    return tile_type.rotated_port_masks[steps] | (tile_type.rotated_adjacency[steps] << CELL_ADJACENCY_SHIFT) | CELL_OCCUPIED
+
+def encode_tile(tile: Optional[PlacedTile]) -> int:
+    """Packs a PlacedTile into its compact integer cell value (0 for an empty cell)."""
+    if tile is None:
+        return 0
+    value = encode_tile_type(tile.tile_type, tile.orientation)
+    if tile.has_stop_sign: value |= CELL_STOP
+    if tile.is_terminal: value |= CELL_TERMINAL
+    return value
+
 class Board:
     def __init__(self, level_data: 'Level'):
         """
@@ -15,15 +75,122 @@ class Board:
         self.playable_rows = level_data.playable_rows
         self.playable_cols = level_data.playable_cols
         
-        self.grid: List[List[Optional[PlacedTile]]] = [[None for _ in range(self.cols)] for _ in range(self.rows)]
+        # Flat storage indexed by r * cols + c. 'cells' is the compact integer core used
+        # by validation and pathfinding; 'tiles' keeps the PlacedTile objects behind
+        # the get_tile/set_tile compatibility view.
+        self.tiles: List[Optional[PlacedTile]] = [None] * (self.rows * self.cols)
+        self.cells = array('L', [0]) * (self.rows * self.cols)
+        # Bumped on every cell mutation; used by caches keyed on board state.
+        self.version = next(_board_versions)
+        # Running totals for AI board scoring, updated by set_tile: unordered pairs of
+        # orthogonally adjacent tiles, and the number of Tree tiles on the board.
+        self.tile_links = 0
+        self.tree_tiles = 0
+        # Zobrist hash of the cells (see zobrist_key), updated on every cell mutation.
+        self.zobrist = 0
         
         # Building data comes directly from the level file
         self.building_coords = level_data.building_coords
         self.coord_to_building: Dict[Tuple[int, int], str] = {v: k for k, v in self.building_coords.items()}
+        # Stable per-building numbers for the stop-owner Zobrist keys (str hashes are salted per process).
+        self.building_ordinals: Dict[str, int] = {b: i for i, b in enumerate(sorted(self.building_coords))}
+        self._build_static_cells()
         
         # These are populated during gameplay
         self.buildings_with_stops: Set[str] = set()
         self.building_stop_locations: Dict[str, Tuple[int, int]] = {}
+        # Reverse index of building_stop_locations (stop coord -> building id), kept in
+        # sync by set_stop_sign/remove_stop_sign for O(1) lookups in pathfinding.
+        self.stop_coord_to_building: Dict[Tuple[int, int], str] = {}
+
+    def _build_static_cells(self):
+        """Precomputes the playable/building flags for every cell of the level."""
+        self.static_cells = array('B', bytes(self.rows * self.cols))
+        for r in range(self.rows):
+            for c in range(self.cols):
+                flags = 0
+                if self.is_playable_coordinate(r, c): flags |= STATIC_PLAYABLE
+                if (r, c) in self.coord_to_building: flags |= STATIC_BUILDING
+                self.static_cells[r * self.cols + c] = flags
+        # Sides of each cell that lead to a playable, non-building neighbour, i.e. the
+        # port masks a tile may have when placed there with no neighbouring track.
+        self.open_port_masks = array('B', bytes(self.rows * self.cols))
+        for r in range(self.rows):
+            for c in range(self.cols):
+                mask = 0
+                for i, direction in enumerate(Direction):
+                    nr, nc = r + direction.value[0], c + direction.value[1]
+                    if 0 <= nr < self.rows and 0 <= nc < self.cols and self.static_cells[nr * self.cols + nc] & (STATIC_PLAYABLE | STATIC_BUILDING) == STATIC_PLAYABLE:
+                        mask |= 1 << i
+                self.open_port_masks[r * self.cols + c] = mask
+        self.move_index_ready = False
+
+    def get_move_index(self) -> Tuple[Set[int], List[Set[int]], Set[int]]:
+        """
+        Returns the move-generation index as flat cell indices (r * cols + c):
+          - frontier cells: empty, placeable cells with track on at least one side,
+          - isolated cells grouped by open_port_masks (a tile fits iff its ports are
+            a subset of that mask),
+          - exchangeable cells: swappable tiles without stop sign or terminal.
+        Built on first use and then maintained incrementally by set_tile and the
+        stop-sign methods.
+        """
+        if not self.move_index_ready:
+            self.frontier_cells: Set[int] = set()
+            self.isolated_cells_by_mask: List[Set[int]] = [set() for _ in range(16)]
+            self.exchangeable_cells: Set[int] = set()
+            self.move_index_ready = True
+            for idx in range(self.rows * self.cols):
+                self._reindex_cell(idx)
+        return self.frontier_cells, self.isolated_cells_by_mask, self.exchangeable_cells
+
+    def _reindex_cell(self, idx: int):
+        self.frontier_cells.discard(idx)
+        self.isolated_cells_by_mask[self.open_port_masks[idx]].discard(idx)
+        self.exchangeable_cells.discard(idx)
+        cell = self.cells[idx]
+        if cell:
+            if self.tiles[idx].tile_type.is_swappable and not cell & (CELL_STOP | CELL_TERMINAL):
+                self.exchangeable_cells.add(idx)
+        elif self.static_cells[idx] & (STATIC_PLAYABLE | STATIC_BUILDING) == STATIC_PLAYABLE:
+            r, c = divmod(idx, self.cols)
+            cells, rows, cols = self.cells, self.rows, self.cols
+            if (r > 0 and cells[idx - cols]) or (r < rows - 1 and cells[idx + cols]) or \
+               (c > 0 and cells[idx - 1]) or (c < cols - 1 and cells[idx + 1]):
+                self.frontier_cells.add(idx)
+            else:
+                self.isolated_cells_by_mask[self.open_port_masks[idx]].add(idx)
+
+    def _reindex_around(self, idx: int):
+        """Refreshes the move index for a changed cell and its four neighbours."""
+        r, c = divmod(idx, self.cols)
+        self._reindex_cell(idx)
+        if r > 0: self._reindex_cell(idx - self.cols)
+        if r < self.rows - 1: self._reindex_cell(idx + self.cols)
+        if c > 0: self._reindex_cell(idx - 1)
+        if c < self.cols - 1: self._reindex_cell(idx + 1)
+
+    @property
+    def grid(self) -> List[List[Optional[PlacedTile]]]:
+        """Row-major list-of-lists view of the placed tiles (read-only snapshot)."""
+        return [self.tiles[r * self.cols:(r + 1) * self.cols] for r in range(self.rows)]
+
+    def copy(self) -> 'Board':
+        """
+        Copies the board for simulation. The cell arrays are copied wholesale and
+        PlacedTile objects are shared, since simulations replace tiles rather than
+        mutating them.
+        """
+        new_board = object.__new__(Board)
+        new_board.__dict__.update(self.__dict__)
+        new_board.tiles = self.tiles[:]
+        new_board.cells = self.cells[:]
+        new_board.buildings_with_stops = set(self.buildings_with_stops)
+        new_board.building_stop_locations = dict(self.building_stop_locations)
+        new_board.stop_coord_to_building = dict(self.stop_coord_to_building)
+        # Simulations rarely need the move index, so copies rebuild it on demand.
+        new_board.move_index_ready = False
+        return new_board
 
     def _initialize_terminals(self, tile_types: Dict[str, TileType], terminal_data: Dict[str, Any]):
         """Initializes terminal tiles based on data from the level file."""
@@ -43,9 +210,9 @@ class Board:
                 coord2, orient2 = tuple(cell2_info[0]), cell2_info[1]
 
                 if self.is_valid_coordinate(*coord1):
-                    self.grid[coord1[0]][coord1[1]] = PlacedTile(curve_tile, orient1, is_terminal=True)
+                    self.set_tile(coord1[0], coord1[1], PlacedTile(curve_tile, orient1, is_terminal=True))
                 if self.is_valid_coordinate(*coord2):
-                    self.grid[coord2[0]][coord2[1]] = PlacedTile(curve_tile, orient2, is_terminal=True)
+                    self.set_tile(coord2[0], coord2[1], PlacedTile(curve_tile, orient2, is_terminal=True))
         print("Finished placing terminal tiles.")
     
     def is_valid_coordinate(self, row: int, col: int) -> bool:
@@ -57,17 +224,84 @@ class Board:
 
     def get_tile(self, row: int, col: int) -> Optional[PlacedTile]:
         if self.is_valid_coordinate(row, col):
-            return self.grid[row][col]
+            return self.tiles[row * self.cols + col]
         return None
 
     def set_tile(self, row: int, col: int, tile: Optional[PlacedTile]):
         if not self.is_valid_coordinate(row, col):
             raise IndexError(f"Coordinate ({row},{col}) out of bounds.")
-        existing = self.grid[row][col]
+        idx = row * self.cols + col
+        existing = self.tiles[idx]
         if existing and existing.is_terminal and tile is not None and not tile.is_terminal:
              print(f"Warning: Cannot overwrite terminal at ({row},{col}).")
              return
-        self.grid[row][col] = tile
+        if (existing is None) != (tile is None):
+            links = sum(1 for d in Direction if self.get_tile(row + d.value[0], col + d.value[1]))
+            self.tile_links += links if tile else -links
+        if existing and existing.tile_type.name.startswith("Tree"): self.tree_tiles -= 1
+        if tile and tile.tile_type.name.startswith("Tree"): self.tree_tiles += 1
+        self.tiles[idx] = tile
+        self._set_cell(idx, encode_tile(tile))
+        self.version = next(_board_versions)
+        if self.move_index_ready: self._reindex_around(idx)
+
+    def _set_cell(self, idx: int, value: int):
+        """Writes a cell value and folds the change into the Zobrist hash."""
+        self.zobrist ^= zobrist_key(idx, self.cells[idx]) ^ zobrist_key(idx, value)
+        self.cells[idx] = value
+
+    def _toggle_stop_owner(self, idx: int, building_id: str):
+        """XORs the (stop square, owning building) pair into or out of the Zobrist hash."""
+        ordinal = self.building_ordinals.get(building_id, len(self.building_ordinals))
+        self.zobrist ^= zobrist_key(idx, ZOBRIST_STOP_OWNER | ordinal)
+
+    def get_cell(self, row: int, col: int) -> int:
+        """Returns the compact integer value of a cell (0 if empty or off the board)."""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self.cells[row * self.cols + col]
+        return 0
+
+    def get_static(self, row: int, col: int) -> int:
+        """Returns the STATIC_* layout flags of a cell (0 if off the board)."""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self.static_cells[row * self.cols + col]
+        return 0
+
+    def set_stop_sign(self, row: int, col: int, building_id: str):
+        """Marks the tile at (row, col) as the stop sign for a building."""
+        idx = row * self.cols + col
+        tile = self.tiles[idx]
+        if tile is None: return
+        # PlacedTiles may be shared with board copies, so swap in a marked copy
+        # instead of mutating the shared object.
+        tile = copy.copy(tile)
+        tile.has_stop_sign = True
+        self.tiles[idx] = tile
+        self._set_cell(idx, self.cells[idx] | CELL_STOP)
+        self.version = next(_board_versions)
+        if self.move_index_ready: self._reindex_cell(idx)
+        self.buildings_with_stops.add(building_id)
+        if old := self.building_stop_locations.get(building_id):
+            self._toggle_stop_owner(old[0] * self.cols + old[1], building_id)
+        self._toggle_stop_owner(idx, building_id)
+        self.building_stop_locations[building_id] = (row, col)
+        self.stop_coord_to_building[(row, col)] = building_id
+
+    def remove_stop_sign(self, row: int, col: int, building_id: str):
+        """Reverses set_stop_sign for the given building."""
+        idx = row * self.cols + col
+        if tile := self.tiles[idx]:
+            tile = copy.copy(tile)
+            tile.has_stop_sign = False
+            self.tiles[idx] = tile
+        self._set_cell(idx, self.cells[idx] & ~CELL_STOP)
+        self.version = next(_board_versions)
+        if self.move_index_ready: self._reindex_cell(idx)
+        self.buildings_with_stops.discard(building_id)
+        if old := self.building_stop_locations.pop(building_id, None):
+            self._toggle_stop_owner(old[0] * self.cols + old[1], building_id)
+        if self.stop_coord_to_building.get((row, col)) == building_id:
+            del self.stop_coord_to_building[(row, col)]
 
     def get_building_at(self, row: int, col: int) -> Optional[str]:
         return self.coord_to_building.get((row, col))
@@ -86,11 +320,14 @@ class Board:
         return {"rows": self.rows, "cols": self.cols, "grid": grid_data, "buildings_with_stops": sorted(list(self.buildings_with_stops)), "building_stop_locations": {k: list(v) for k, v in self.building_stop_locations.items()},}
     @staticmethod
     def from_dict(data: Dict, tile_types: Dict[str, 'TileType']) -> 'Board': # ... implementation ...
-        rows = data.get("rows", GRID_ROWS); cols = data.get("cols", GRID_COLS); board = Board(rows, cols); board.grid = [[None for _ in range(cols)] for _ in range(rows)]; # ... rest of implementation ...
+        rows = data.get("rows", GRID_ROWS); cols = data.get("cols", GRID_COLS); board = Board(rows, cols); # ... rest of implementation ...
         grid_data = data.get("grid", []); # ... loop through grid_data ...
         for r in range(min(len(grid_data), board.rows)):
             row_data = grid_data[r]
             for c in range(min(len(row_data), board.cols)):
-                 tile_data = row_data[c]; board.grid[r][c] = PlacedTile.from_dict(tile_data, tile_types)
+                 tile_data = row_data[c]; board.set_tile(r, c, PlacedTile.from_dict(tile_data, tile_types))
         board.buildings_with_stops = set(data.get("buildings_with_stops", [])); # ... rest of implementation ...
-        loaded_stop_locs = data.get("building_stop_locations", {}); board.building_stop_locations = {k: tuple(v) for k, v in loaded_stop_locs.items() if isinstance(v, list) and len(v) == 2}; return board
+        loaded_stop_locs = data.get("building_stop_locations", {}); board.building_stop_locations = {k: tuple(v) for k, v in loaded_stop_locs.items() if isinstance(v, list) and len(v) == 2}
+        board.stop_coord_to_building = {v: k for k, v in board.building_stop_locations.items()}
+        for building_id, (r, c) in board.building_stop_locations.items(): board._toggle_stop_owner(r * board.cols + c, building_id)
+        return board
@@ -73,7 +73,9 @@ class PlaceTileCommand(Command):
         placed_tile = PlacedTile(self.tile_type, self.orientation)
         self.game.board.set_tile(self.row, self.col, placed_tile)
 
-        self.game.rule_engine.check_and_place_stop_sign(self.game, placed_tile, self.row, self.col)
+        # Remember any stop sign this placement created so undo can remove it again.
+        self._building_id_stopped = self.game.rule_engine.check_and_place_stop_sign(self.game, placed_tile, self.row, self.col)
+        self._stop_sign_placed = self._building_id_stopped is not None
         
         self.game.actions_taken_this_turn += 1
         return True
@@ -84,10 +86,7 @@ class PlaceTileCommand(Command):
         if self._stop_sign_placed and self._building_id_stopped:
             tile = self.game.board.get_tile(self.row, self.col)
             if tile and tile.has_stop_sign:
-                 tile.has_stop_sign = False
-                 self.game.board.buildings_with_stops.discard(self._building_id_stopped)
-                 if self._building_id_stopped in self.game.board.building_stop_locations:
-                     del self.game.board.building_stop_locations[self._building_id_stopped]
+                 self.game.board.remove_stop_sign(self.row, self.col, self._building_id_stopped)
 
         self.game.board.set_tile(self.row, self.col, None)
         if self._original_hand_contains_tile:
@@ -321,10 +320,7 @@ class CombinedActionCommand(Command):
                 if undo_action['stop_placed'] and (building_id := undo_action['building_id']):
                     tile = self.game.board.get_tile(r, c)
                     if tile and tile.has_stop_sign:
-                        tile.has_stop_sign = False
-                        self.game.board.buildings_with_stops.discard(building_id)
-                        if building_id in self.game.board.building_stop_locations:
-                            del self.game.board.building_stop_locations[building_id]
+                        self.game.board.remove_stop_sign(r, c, building_id)
                 
                 self.game.board.set_tile(r, c, None)
                 self.player.hand.append(tile_to_return)
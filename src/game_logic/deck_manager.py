@@ -1,6 +1,8 @@
 # game_logic/deck_manager.py
 from __future__ import annotations
-from typing import List, Dict, TYPE_CHECKING
+from typing import List, Dict, Iterable, Iterator, Optional, Callable, TYPE_CHECKING
+from collections.abc import Sequence
+import copy
 import random
 
 if TYPE_CHECKING:
@@ -12,16 +14,193 @@ if TYPE_CHECKING:
 from .cards import LineCard, RouteCard
 import common.constants as C
 
+class DrawPile:
+    """
+    The tile draw pile as a counted multiset (TileType -> copies left). A draw picks a
+    type with probability proportional to its weighted count, which for plain draws
+    is the same distribution as popping a shuffled list, in O(number of types).
+    Counting, adding and removing a given type are O(1).
+    Tiles put under the pile (insert(0, tile), e.g. sold to the scrapyard) go to an
+    ordered `bottom` list instead, lowest first, and are only drawn once the counted
+    part is empty. The list operations older callers use (iteration, len, count,
+    remove, append, extend, insert(0), pop()) still work; positions other than the
+    bottom for insert and the top for pop raise, since the rest of the pile has no order.
+    """
+    def __init__(self, tiles: Iterable['TileType'] = (), rng: Optional[random.Random] = None, bottom: Iterable['TileType'] = ()):
+        self.counts: Dict['TileType', int] = {}
+        self.bottom: List['TileType'] = list(bottom)
+        self.total = len(self.bottom)
+        # Called with the tile type after every change of its count (see DeckManager).
+        self.on_change: Optional[Callable[['TileType'], None]] = None
+        # Seeded from the global generator so random.seed() still reproduces a game.
+        self.rng = rng or random.Random(random.getrandbits(64))
+        for tile in tiles: self.add(tile)
+
+    def add(self, tile: 'TileType', n: int = 1):
+        self.counts[tile] = self.counts.get(tile, 0) + n
+        self.total += n
+        if self.on_change: self.on_change(tile)
+
+    def remove(self, tile: 'TileType'):
+        """
+        Removes one copy of tile (ValueError if there is none, like list.remove). As with
+        list.remove, the lowest copy goes first, so tiles under the pile are taken first.
+        """
+        if tile in self.bottom:
+            self.bottom.remove(tile)
+        else:
+            n = self.counts.get(tile, 0)
+            if n == 0: raise ValueError(f"{getattr(tile, 'name', tile)} is not in the draw pile")
+            if n == 1: del self.counts[tile]
+            else: self.counts[tile] = n - 1
+        self.total -= 1
+        if self.on_change: self.on_change(tile)
+
+    def count(self, tile: 'TileType') -> int:
+        n = self.counts.get(tile, 0)
+        return n + self.bottom.count(tile) if self.bottom else n
+
+    def types(self) -> List['TileType']:
+        """Distinct tile types with at least one copy left (counted part first)."""
+        return list(self.counts) + [t for t in dict.fromkeys(self.bottom) if t not in self.counts]
+
+    def draw(self, weight: Optional[Callable[['TileType'], float]] = None) -> Optional['TileType']:
+        """
+        Removes and returns a random tile, or None if the pile is empty. weight(tile_type),
+        if given, scales each copy's chance (e.g. the king AI's Tree bias). Tiles under
+        the pile come out last, topmost first.
+        """
+        if not self.total: return None
+        if not self.counts:
+            tile = self.bottom.pop()
+            self.total -= 1
+            if self.on_change: self.on_change(tile)
+            return tile
+        types = list(self.counts)
+        weights = [n * weight(t) for t, n in self.counts.items()] if weight else list(self.counts.values())
+        tile = self.rng.choices(types, weights=weights, k=1)[0]
+        n = self.counts[tile]
+        if n == 1: del self.counts[tile]
+        else: self.counts[tile] = n - 1
+        self.total -= 1
+        if self.on_change: self.on_change(tile)
+        return tile
+
+    def names(self) -> 'DrawPileNames':
+        """Read-only list-like view of the pile's tile names, for mod hooks."""
+        return DrawPileNames(self)
+
+    def __getstate__(self):
+        # The change callback belongs to the live DeckManager, not to pickled copies.
+        state = self.__dict__.copy()
+        state['on_change'] = None
+        return state
+
+    def copy(self) -> 'DrawPile':
+        # The copy's generator continues from this one's state without advancing it.
+        rng = random.Random()
+        rng.setstate(self.rng.getstate())
+        new_pile = DrawPile(rng=rng, bottom=self.bottom)
+        new_pile.counts = dict(self.counts)
+        new_pile.total = self.total
+        return new_pile
+
+    # --- List compatibility ---
+    def __len__(self) -> int: return self.total
+    def __bool__(self) -> bool: return self.total > 0
+    def __contains__(self, tile) -> bool: return self.counts.get(tile, 0) > 0 or tile in self.bottom
+    def __iter__(self) -> Iterator['TileType']:
+        # Bottom first, like the old list.
+        yield from list(self.bottom)
+        for tile, n in list(self.counts.items()):
+            for _ in range(n): yield tile
+    def append(self, tile: 'TileType'): self.add(tile)
+    def extend(self, tiles: Iterable['TileType']):
+        for tile in tiles: self.add(tile)
+    def insert(self, index: int, tile: 'TileType'):
+        if index != 0: raise IndexError("tiles can only be inserted at the bottom (index 0) of the draw pile")
+        self.bottom.insert(0, tile)
+        self.total += 1
+        if self.on_change: self.on_change(tile)
+    def pop(self, index: int = -1) -> 'TileType':
+        if index != -1: raise IndexError("tiles can only be popped from the top (index -1) of the draw pile")
+        tile = self.draw()
+        if tile is None: raise IndexError("pop from empty draw pile")
+        return tile
+
+
+class DrawPileNames(Sequence):
+    """List-like view of a DrawPile's tile names (count and 'in' are O(1) without a bottom)."""
+    def __init__(self, pile: DrawPile):
+        self.pile = pile
+
+    def __len__(self) -> int: return self.pile.total
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0: index += self.pile.total
+        if not 0 <= index < self.pile.total: raise IndexError("draw pile index out of range")
+        bottom = self.pile.bottom
+        if index < len(bottom): return bottom[index].name
+        index -= len(bottom)
+        for tile, n in self.pile.counts.items():
+            if index < n: return tile.name
+            index -= n
+
+    def __contains__(self, name) -> bool: return self.count(name) > 0
+
+    def count(self, name) -> int:
+        return sum(n for tile, n in self.pile.counts.items() if tile.name == name) + sum(1 for tile in self.pile.bottom if tile.name == name)
+
+
 class DeckManager:
     """Manages all game decks: tiles, line cards, and route cards."""
     def __init__(self, game: 'Game'):
         self.game = game
-        self.tile_draw_pile: List['TileType'] = []
+        # Callables (deck_manager, tile_type) told whenever a tile type's supply changes;
+        # tile_type is None when the whole pile or the initial supply was replaced.
+        self.supply_listeners: List[Callable[['DeckManager', Optional['TileType']], None]] = []
+        self.tile_draw_pile = DrawPile()
         self.line_cards_pile: List['LineCard'] = []
         # --- START OF CHANGE ---
         self.initial_tile_counts: Dict[str, int] = {}
         # --- END OF CHANGE ---
 
+    @property
+    def tile_draw_pile(self) -> DrawPile:
+        return self._tile_draw_pile
+
+    @tile_draw_pile.setter
+    def tile_draw_pile(self, tiles: Iterable['TileType']):
+        # Plain lists (e.g. from save files) are converted to a counted pile.
+        self._tile_draw_pile = tiles if isinstance(tiles, DrawPile) else DrawPile(tiles)
+        self._tile_draw_pile.on_change = self._notify_supply_changed
+        self._notify_supply_changed(None)
+
+    def copy_for_simulation(self, sim_game: 'Game') -> 'DeckManager':
+        """Detached deck for a planning snapshot: own pile, cards and supply record, no listeners."""
+        sim_deck = copy.copy(self)
+        sim_deck.game = sim_game
+        sim_deck.supply_listeners = []
+        sim_deck.tile_draw_pile = self._tile_draw_pile.copy()
+        sim_deck.line_cards_pile = self.line_cards_pile[:]
+        sim_deck.initial_tile_counts = dict(self.initial_tile_counts)
+        return sim_deck
+
+    def add_supply_listener(self, listener: Callable[['DeckManager', Optional['TileType']], None]):
+        if listener not in self.supply_listeners: self.supply_listeners.append(listener)
+
+    def _notify_supply_changed(self, tile_type: Optional['TileType']):
+        for listener in self.supply_listeners: listener(self, tile_type)
+
+    def get_supply(self, tile_type: 'TileType') -> int:
+        """Live number of tile_type copies left in the draw pile."""
+        return self._tile_draw_pile.count(tile_type)
+
+    def scrap_tile(self, tile_type: 'TileType'):
+        """Takes one copy of tile_type out of the game for good (lowers its initial supply)."""
+        self.initial_tile_counts[tile_type.name] -= 1
+        self._notify_supply_changed(tile_type)
+
     def create_and_shuffle_piles(self):
         """Creates and shuffles the tile draw pile and line card pile."""
         print("Creating draw piles...")
@@ -37,11 +216,11 @@ class DeckManager:
         print(f"Initial tile supply recorded: {sum(self.initial_tile_counts.values())} total tiles.")
         # --- END OF CHANGE ---
 
-        self.tile_draw_pile = []
+        self.tile_draw_pile = DrawPile()
         for name, count in tile_counts.items():
             if tile_type := self.game.tile_types.get(name):
-                self.tile_draw_pile.extend([tile_type] * count)
-        random.shuffle(self.tile_draw_pile)
+                self.tile_draw_pile.add(tile_type, count)
+        self._notify_supply_changed(None)
         print(f"Tile draw pile created: {len(self.tile_draw_pile)} tiles.")
 
         # Create line card pile
@@ -91,22 +270,17 @@ class DeckManager:
         if not self.tile_draw_pile or len(player.hand) >= C.HAND_TILE_LIMIT:
             return False
 
-        handled_by_mod, name = self.game.mod_manager.on_tile_drawn(self.game, player, None, [t.name for t in self.tile_draw_pile])
-        if handled_by_mod and name and (chosen_tile := next((t for t in self.tile_draw_pile if t.name == name), None)):
+        handled_by_mod, name = self.game.mod_manager.on_tile_drawn(self.game, player, None, self.tile_draw_pile.names())
+        if handled_by_mod and name and (chosen_tile := self.game.tile_types.get(name)) and chosen_tile in self.tile_draw_pile:
             self.tile_draw_pile.remove(chosen_tile)
             player.hand.append(chosen_tile)
             return True
 
         if isinstance(player, AIPlayer) and player.difficulty_mode == 'king':
-            tree_tiles = [t for t in self.tile_draw_pile if t.name.startswith("Tree")]
-            if tree_tiles:
-                weights = [C.KING_AI_TREE_TILE_BIAS if t.name.startswith("Tree") else 1 for t in self.tile_draw_pile]
-                chosen_tile = random.choices(self.tile_draw_pile, weights=weights, k=1)[0]
-                self.tile_draw_pile.remove(chosen_tile)
-                player.hand.append(chosen_tile)
-                return True
-
-        drawn_tile = self.tile_draw_pile.pop()
+            # Each Tree copy is KING_AI_TREE_TILE_BIAS times as likely as any other tile.
+            drawn_tile = self.tile_draw_pile.draw(lambda t: C.KING_AI_TREE_TILE_BIAS if t.name.startswith("Tree") else 1)
+        else:
+            drawn_tile = self.tile_draw_pile.draw()
         player.hand.append(drawn_tile)
         return True
     
@@ -19,22 +19,23 @@ from .player import Player, HumanPlayer, AIPlayer, RouteStep
 from .board import Board
 from .command_history import CommandHistory
 from .commands import MoveCommand
-from .pathfinding import BFSPathfinder
+from .pathfinding import create_pathfinder
 from .rule_engine import RuleEngine
 from .turn_manager import TurnManager
-from .deck_manager import DeckManager
+from .deck_manager import DeckManager, DrawPile
 import common.constants as C
 
 class Game:
-    def __init__(self, player_types: List[str], difficulty: str, mod_manager: 'ModManager', level_data: Level):
+    def __init__(self, player_types: List[str], difficulty: str, mod_manager: 'ModManager', level_data: Level, pathfinder: str = C.DEFAULT_PATHFINDER):
         """
         Initializes the main Game object.
 
         Args:
             player_types (List[str]): A list of player types ('human' or 'ai').
-            difficulty (str): The AI difficulty ('normal' or 'king').
+            difficulty (str): The AI difficulty ('normal', 'king' or 'mcts').
             mod_manager (ModManager): The game's mod manager instance.
             level_data (Level): The data object for the map to be played.
+            pathfinder (str): Route search algorithm, 'bfs', 'astar' or 'legs'.
         """
         if not 1 <= len(player_types) <= 6:
             raise ValueError("Total players must be 1-6.")
@@ -44,7 +45,7 @@ class Game:
         self.rule_engine = RuleEngine()
         self.turn_manager = TurnManager()
         self.deck_manager = DeckManager(self)
-        self.pathfinder: Pathfinder = BFSPathfinder()
+        self.pathfinder: Pathfinder = create_pathfinder(pathfinder)
         self.mod_manager = mod_manager
         self.visualizer: Optional['GameScene'] = None
         self.command_history = CommandHistory()
@@ -72,12 +73,12 @@ class Game:
         self.HAND_TILE_LIMIT = C.HAND_TILE_LIMIT
 
         # --- Player Creation ---
-        from .ai_strategy import HardStrategy, GreedySequentialStrategy
+        from .ai_strategy import create_strategy
         for i, p_type in enumerate(player_types):
             if p_type.lower() == 'human':
                 self.players.append(HumanPlayer(i, self.difficulty))
             elif p_type.lower() == 'ai':
-                self.players.append(AIPlayer(i, HardStrategy(), self.difficulty))
+                self.players.append(AIPlayer(i, create_strategy(C.AI_STRATEGY_BY_DIFFICULTY.get(self.difficulty, 'hard')), self.difficulty))
             else:
                 raise ValueError(f"Unknown player type in config: {p_type}")
         
@@ -184,17 +185,12 @@ class Game:
         t1, t2 = self.get_terminal_coords(player.line_card.line_number)
         if not t1 or not t2: return False, None, None
 
-        path1, cost1 = self.pathfinder.find_path(self, player, [t1] + stops + [t2])
-        path2, cost2 = self.pathfinder.find_path(self, player, [t2] + stops + [t1])
+        # One search covers both terminal orders; the route starts at the chosen terminal.
+        optimal_path, cost = self.pathfinder.find_best_route(self, player, t1, t2, stops)
+        if cost == float('inf'): return False, None, None
 
-        valid1, valid2 = (cost1 != float('inf')), (cost2 != float('inf'))
-        if not valid1 and not valid2: return False, None, None
-        
-        chosen_start, optimal_path = (t1, path1) if valid1 and (not valid2 or cost1 <= cost2) else (t2, path2)
-        
-        if chosen_start:
-            return True, chosen_start, optimal_path
-        return False, None, None
+        chosen_start = optimal_path[0].coord
+        return True, chosen_start, optimal_path
 
     def handle_route_completion(self, player: Player, chosen_start: Tuple[int, int], optimal_path: List[RouteStep]):
         """Transitions a player to the DRIVING phase."""
@@ -230,7 +226,6 @@ class Game:
         if player.hand:
             print(f"  Returning {len(player.hand)} tiles to the draw pile.")
             self.deck_manager.tile_draw_pile.extend(player.hand)
-            random.shuffle(self.deck_manager.tile_draw_pile)
             player.hand = []
 
     def can_player_make_any_move(self, player: Player) -> bool:
@@ -247,6 +242,8 @@ class Game:
                 "board": self.board.to_dict(),
                 "players": [p.to_dict() for p in self.players],
                 "tile_draw_pile": [tile.name for tile in self.deck_manager.tile_draw_pile],
+                # The first N names above are the tiles under the pile (DrawPile.bottom).
+                "tile_draw_pile_bottom": len(self.deck_manager.tile_draw_pile.bottom),
                 "active_player_index": self.active_player_index,
                 "game_phase": self.game_phase.name,
                 "current_turn": self.current_turn,
@@ -285,7 +282,9 @@ class Game:
             winner_id = data.get("winner_id")
             game.winner = game.players[winner_id] if winner_id is not None else None
                 
-            game.deck_manager.tile_draw_pile = [tile_types[name] for name in data.get("tile_draw_pile", [])]
+            pile_tiles = [tile_types[name] for name in data.get("tile_draw_pile", [])]
+            bottom_count = data.get("tile_draw_pile_bottom", 0)
+            game.deck_manager.tile_draw_pile = DrawPile(pile_tiles[bottom_count:], bottom=pile_tiles[:bottom_count])
             game.deck_manager.line_cards_pile = [] # Cards are considered fully dealt
             
             mod_manager.deactivate_all_mods()
@@ -297,8 +296,14 @@ class Game:
         except Exception as e:
             print(f"!!! Error loading game from {filename}: {e} !!!"); traceback.print_exc(); return None
         
-    def copy_for_simulation(self) -> 'Game':
-        """Creates a deep copy of the essential game state for AI planning."""
+    def copy_for_simulation(self, detach_mods: bool = False) -> 'Game':
+        """
+        Creates a cheap snapshot of the essential game state for AI planning. The board
+        copies its flat cell arrays and players copy their hands; everything else that
+        simulations only read is shared. With detach_mods (planning on another thread)
+        the deck and the mods are copied too, so mod planning hooks that cache or
+        write state never touch the live ones.
+        """
         sim_game = object.__new__(Game)
         
         sim_game.rule_engine = self.rule_engine
@@ -308,14 +313,25 @@ class Game:
         sim_game.MAX_PLAYER_ACTIONS = self.MAX_PLAYER_ACTIONS
         sim_game.level_data = self.level_data
         
-        sim_game.board = copy.deepcopy(self.board)
-        sim_game.players = copy.deepcopy(self.players)
+        sim_game.board = self.board.copy()
+        sim_game.players = [p.copy() for p in self.players]
         
         sim_game.game_phase = self.game_phase
         sim_game.active_player_index = self.active_player_index
         
+        # References that mod planners consult (market supply, turn counters).
+        sim_game.mod_manager = self.mod_manager
+        sim_game.deck_manager = self.deck_manager
+        if detach_mods:
+            sim_game.deck_manager = self.deck_manager.copy_for_simulation(sim_game)
+            sim_game.mod_manager = self.mod_manager.copy_for_simulation(sim_game)
+        sim_game.current_turn = self.current_turn
+        sim_game.actions_taken_this_turn = self.actions_taken_this_turn
+        sim_game.rail_foundation_capital = self.rail_foundation_capital
+        sim_game.visualizer = None
+        
         # --- START OF CHANGE: Ensure the simulation copy also has these attributes ---
-        sim_game.live_auctions = copy.deepcopy(self.live_auctions)
+        sim_game.live_auctions = [dict(auction) for auction in self.live_auctions]
         # --- END OF CHANGE ---
         
         return sim_game
@@ -342,7 +358,7 @@ class Game:
                     market_price = eco_mod.get_market_price(self, tile_type)
                     scrapyard_yield = eco_mod.config.get("scrapyard_yield", 0.3)
                     payout = int(market_price * scrapyard_yield)
-                    self.deck_manager.initial_tile_counts[tile_type.name] -= 1
+                    self.deck_manager.scrap_tile(tile_type)
                     print(f"Auction for {tile_type.name} received no bids. Defaulting to scrapyard for ${payout}.")
                 
                 # Case 2: Bids exist
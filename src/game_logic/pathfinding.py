@@ -1,9 +1,10 @@
 # game_logic/pathfinding.py
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Optional, Generator, TYPE_CHECKING
-from queue import PriorityQueue
-from collections import deque, namedtuple
+from typing import List, Dict, Tuple, Optional, Generator, Set, TYPE_CHECKING
+import heapq
+import copy
+from collections import deque, namedtuple, OrderedDict
 
 if TYPE_CHECKING:
     from .game import Game
@@ -11,159 +12,377 @@ if TYPE_CHECKING:
 
 from .enums import Direction
 from .tile import TileType
+from .board import CELL_PORT_MASK, CELL_ADJACENCY_SHIFT
 from .player import RouteStep
+from common.constants import ROUTE_CACHE_MAX_SEQUENCES, ROUTE_CACHE_ENTRIES_PER_SEQUENCE
 
 PathState = namedtuple('PathState', ['pos', 'arrival_dir', 'seq_idx'])
 
+# Port index -> Direction (N, E, S, W), matching the compact cell encoding in board.py.
+_DIRECTIONS: Tuple[Direction, ...] = tuple(Direction)
+_DIRECTION_INDEX = {d: i for i, d in enumerate(_DIRECTIONS)}
+# Exits are expanded in alphabetical order (E, N, S, W), the order of the tile
+# connection tables, so equal-length routes are tie-broken as before.
+_EXIT_SCAN_ORDER: Tuple[int, ...] = (1, 0, 2, 3)
+
 def _get_valid_successors(game: 'Game', current_state: PathState, goal_node_sequence: List[Tuple[int, int]], previous_target_node: Optional[Tuple[int, int]]) -> Generator[PathState, None, None]:
     """
     Helper generator that yields all valid next states from a given state,
     incorporating all movement rules (U-turns, forced exits from GOAL stops).
     """
     current_pos, arrival_dir, seq_idx = current_state
+    board = game.board
     
-    tile = game.board.get_tile(current_pos[0], current_pos[1])
-    if not tile: return
+    cell = board.get_cell(current_pos[0], current_pos[1])
+    if not cell: return
 
     forced_exit_dir: Optional[Direction] = None
-    is_stop = current_pos in game.board.building_stop_locations.values()
+    is_stop = current_pos in board.stop_coord_to_building
     was_the_required_goal = (current_pos == previous_target_node)
     
     # This block now correctly calls the rule engine
     if is_stop and was_the_required_goal and arrival_dir and game.rule_engine.is_valid_stop_entry(game, current_pos, arrival_dir):
         forced_exit_dir = arrival_dir
     
-    # --- START OF FIX ---
-    # Call get_effective_connections on the rule_engine, not the game object.
-    conns = game.rule_engine.get_effective_connections(tile.tile_type, tile.orientation)
-    # --- END OF FIX ---
-    
-    possible_exits: List[Direction] = []
-    if forced_exit_dir:
-        entry_port = Direction.opposite(arrival_dir).name if arrival_dir else None
-        if entry_port and forced_exit_dir.name in conns.get(entry_port, []):
-            possible_exits.append(forced_exit_dir)
+    if arrival_dir:
+        entry_idx = (_DIRECTION_INDEX[arrival_dir] + 2) % 4
+        exit_mask = (cell >> (CELL_ADJACENCY_SHIFT + 4 * entry_idx)) & CELL_PORT_MASK
     else:
-        entry_port = Direction.opposite(arrival_dir).name if arrival_dir else None
-        exit_strs = conns.get(entry_port, []) if entry_port else list(set(ex for exits in conns.values() for ex in exits))
-        possible_exits = [Direction.from_str(s) for s in exit_strs]
+        exit_mask = cell & CELL_PORT_MASK
+    if forced_exit_dir:
+        exit_mask &= 1 << _DIRECTION_INDEX[forced_exit_dir]
 
-    for exit_dir in possible_exits:
+    for i in _EXIT_SCAN_ORDER:
+        if not (exit_mask >> i) & 1: continue
+        exit_dir = _DIRECTIONS[i]
         n_pos = (current_pos[0] + exit_dir.value[0], current_pos[1] + exit_dir.value[1])
-        if not game.board.is_valid_coordinate(n_pos[0], n_pos[1]): continue
-        
-        n_tile = game.board.get_tile(n_pos[0], n_pos[1])
-        if not n_tile: continue
-        
-        # --- START OF FIX ---
-        n_conns = game.rule_engine.get_effective_connections(n_tile.tile_type, n_tile.orientation)
-        # --- END OF FIX ---
         
-        req_entry = Direction.opposite(exit_dir).name
-        if req_entry not in {ex for n_exits in n_conns.values() for ex in n_exits}: continue
+        # Empty and off-board cells are 0, so this also covers the bounds check.
+        n_cell = board.get_cell(n_pos[0], n_pos[1])
+        if not (n_cell >> ((i + 2) % 4)) & 1: continue
 
         next_seq_idx = seq_idx
         if seq_idx < len(goal_node_sequence) and n_pos == goal_node_sequence[seq_idx]:
             # --- START OF FIX 3 ---
             # This check also needs to use the rule engine
-            if not (n_pos in game.board.building_stop_locations.values()) or game.rule_engine.is_valid_stop_entry(game, n_pos, exit_dir):
+            if n_pos not in board.stop_coord_to_building or game.rule_engine.is_valid_stop_entry(game, n_pos, exit_dir):
                 next_seq_idx += 1
             # --- END OF FIX 3 ---
         
         yield PathState(pos=n_pos, arrival_dir=exit_dir, seq_idx=next_seq_idx)
 
+class RouteCache:
+    """
+    Remembers search results per node sequence together with the board cells the
+    search actually read (every visited cell and its neighbours). An entry stays
+    valid on a changed board as long as none of those cells changed, so edits away
+    from the route and its explored area do not force a new search.
+    """
+    def __init__(self, max_sequences: int = ROUTE_CACHE_MAX_SEQUENCES, entries_per_sequence: int = ROUTE_CACHE_ENTRIES_PER_SEQUENCE):
+        self.max_sequences = max_sequences
+        self.entries_per_sequence = entries_per_sequence
+        # key -> list of [board_version, read_cells, path, cost], most recent first
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, board, key) -> Optional[Tuple[Optional[List[RouteStep]], int]]:
+        entries = self._entries.get(key)
+        if entries is None:
+            self.misses += 1
+            return None
+        cells = board.cells
+        for entry in entries:
+            version, read_cells, path, cost = entry
+            if version != board.version:
+                if any(cells[idx] != value for idx, value in read_cells):
+                    continue
+                entry[0] = board.version
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return (path[:] if path else path), cost
+        self.misses += 1
+        return None
+
+    def store(self, board, key, path: Optional[List[RouteStep]], cost, visited_positions):
+        rows, cols, cells = board.rows, board.cols, board.cells
+        read = set()
+        for r, c in visited_positions:
+            for nr, nc in ((r, c), (r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if 0 <= nr < rows and 0 <= nc < cols:
+                    read.add(nr * cols + nc)
+        read_cells = tuple((idx, cells[idx]) for idx in read)
+        entries = self._entries.setdefault(key, [])
+        entries.insert(0, [board.version, read_cells, (path[:] if path else path), cost])
+        del entries[self.entries_per_sequence:]
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_sequences:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def copy(self) -> 'RouteCache':
+        new_cache = RouteCache(self.max_sequences, self.entries_per_sequence)
+        new_cache._entries = OrderedDict((key, [list(entry) for entry in entries]) for key, entries in self._entries.items())
+        return new_cache
+
+    def __getstate__(self):
+        # Board versions come from a per-process counter, so entries shipped to
+        # another process must be revalidated by cell contents (version 0 never matches).
+        state = self.__dict__.copy()
+        state['_entries'] = OrderedDict((key, [[0] + entry[1:] for entry in entries]) for key, entries in self._entries.items())
+        return state
+
+def _reconstruct_route(came_from: dict, final_state: tuple, goal_node_coords: Set[Tuple[int, int]]) -> List[RouteStep]:
+    """Walks came_from back from a completed (order, PathState) search state."""
+    path: List[RouteStep] = []
+    curr = final_state
+    while curr:
+        state = curr[1]
+        path.append(RouteStep(state.pos, state.pos in goal_node_coords, state.arrival_dir))
+        curr = came_from.get(curr)
+    return path[::-1]
+
 class Pathfinder(ABC):
-    @abstractmethod
+    def __init__(self):
+        self.route_cache = RouteCache()
+
+    def fork(self) -> 'Pathfinder':
+        """Returns a pathfinder with private copies of the caches, for use on another thread."""
+        new_pathfinder = copy.copy(self)
+        for name, value in self.__dict__.items():
+            if isinstance(value, RouteCache): setattr(new_pathfinder, name, value.copy())
+        return new_pathfinder
+
     def find_path(self, game: 'Game', player: 'Player', node_sequence: List[Tuple[int, int]], is_hypothetical: bool = False) -> Tuple[Optional[List[RouteStep]], int]:
+        """Finds the route through node_sequence, reusing a cached result when still valid."""
+        key = tuple(node_sequence)
+        if cached := self.route_cache.lookup(game.board, key):
+            return cached
+        path, cost, visited_positions = self._search(game, [node_sequence])
+        self.route_cache.store(game.board, key, path, cost, visited_positions)
+        return path, cost
+
+    def find_best_route(self, game: 'Game', player: 'Player', terminal1: Tuple[int, int], terminal2: Tuple[int, int], stops: List[Tuple[int, int]], is_hypothetical: bool = False) -> Tuple[Optional[List[RouteStep]], int]:
+        """
+        Finds the cheaper of [terminal1]+stops+[terminal2] and [terminal2]+stops+[terminal1]
+        in a single search seeded from both terminals. Ties go to the terminal1 order,
+        matching the result of running find_path on both orders. The chosen start
+        terminal is path[0].coord.
+        """
+        forward = [terminal1] + stops + [terminal2]
+        backward = [terminal2] + stops + [terminal1]
+        key = ('either',) + tuple(forward)
+        if cached := self.route_cache.lookup(game.board, key):
+            return cached
+        path, cost, visited_positions = self._search(game, [forward, backward])
+        self.route_cache.store(game.board, key, path, cost, visited_positions)
+        return path, cost
+
+    @abstractmethod
+    def _search(self, game: 'Game', node_sequences: List[List[Tuple[int, int]]]) -> Tuple[Optional[List[RouteStep]], int, Set[Tuple[int, int]]]:
+        """
+        Searches all node sequences at once and returns the cheapest complete route
+        (earliest sequence on ties), plus every position visited (for the route cache).
+        """
         pass
 
 class AStarPathfinder(Pathfinder):
-    """The concrete implementation of the A* algorithm for finding the sequential route."""
-    def _heuristic_sequential(self, pos: Tuple[int, int], idx: int, seq: List[Tuple[int, int]]) -> int:
-        cost = 0
-        if idx < len(seq): cost += abs(pos[0] - seq[idx][0]) + abs(pos[1] - seq[idx][1])
-        for i in range(idx, len(seq) - 1): cost += abs(seq[i][0] - seq[i+1][0]) + abs(seq[i][1] - seq[i+1][1])
-        return cost
-
-    def find_path(self, game: 'Game', player: 'Player', full_node_sequence: List[Tuple[int, int]], is_hypothetical: bool = False) -> Tuple[Optional[List[RouteStep]], int]:
-        start_pos = full_node_sequence[0]
-        start_state = PathState(pos=start_pos, arrival_dir=None, seq_idx=1)
-        if not game.board.get_tile(start_pos[0], start_pos[1]): return None, float('inf')
-        
-        open_set = PriorityQueue(); tie_breaker = 0
-        f_score = self._heuristic_sequential(start_pos, 1, full_node_sequence)
-        open_set.put((f_score, tie_breaker, start_state))
-        
-        g_scores, came_from = {start_state: 0}, {start_state: None}
-        goal_node_coords = set(full_node_sequence)
-
-        while not open_set.empty():
-            _, _, current_state = open_set.get()
-            if current_state.seq_idx == len(full_node_sequence):
-                path: List[RouteStep] = []
-                curr = current_state
-                while curr:
-                    is_goal = curr.pos in goal_node_coords
-                    path.append(RouteStep(curr.pos, is_goal, curr.arrival_dir))
-                    curr = came_from.get(curr)
-                return path[::-1], g_scores[current_state]
-            
-            previous_target_node = full_node_sequence[current_state.seq_idx - 1] if current_state.seq_idx > 0 else None
-            for successor_state in _get_valid_successors(game, current_state, full_node_sequence, previous_target_node):
-                # NEW to prioritise straight tiles
-                move_cost = 1
-                
-                # Calculate the "ideal" direction from the current node to the next goal
-                dy = next_goal_in_sequence[0] - current_pos[0]
-                dx = next_goal_in_sequence[1] - current_pos[1]
-                
-                # If the move's direction deviates from the most direct axis to the goal, penalize it.
-                # This encourages staying on a straight line towards the objective.
-                exit_dir = successor_state.arrival_dir
-                if abs(dx) > abs(dy): # Goal is primarily horizontal
-                    if exit_dir not in (Direction.E if dx > 0 else Direction.W,):
-                        move_cost += 1
-                else: # Goal is primarily vertical
-                    if exit_dir not in (Direction.S if dy > 0 else Direction.N,):
-                        move_cost += 1
-                
-                new_cost = g_scores[current_state] + move_cost
-                # END NEW
-                # new_cost = g_scores[current_state] + 1  # Commented out prev new_cost
-                if new_cost < g_scores.get(successor_state, float('inf')):
-                    g_scores[successor_state], came_from[successor_state] = new_cost, current_state
-                    f_score = new_cost + self._heuristic_sequential(successor_state.pos, successor_state.seq_idx, full_node_sequence)
+    """
+    A* over PathState with unit step costs, so routes have the same cost as BFS.
+    The heuristic (Manhattan distance to the next goal plus the Manhattan length of
+    the remaining goal chain) never overestimates and is consistent, so the first
+    time the final goal is popped the route is optimal.
+    """
+    def _search(self, game: 'Game', node_sequences: List[List[Tuple[int, int]]]) -> Tuple[Optional[List[RouteStep]], int, Set[Tuple[int, int]]]:
+        # remaining_chain[order][i]: Manhattan length of goal i -> ... -> last goal, so
+        # the heuristic is one lookup instead of a loop over the sequence.
+        remaining_chain = []
+        for seq in node_sequences:
+            chain = [0] * (len(seq) + 1)
+            for i in range(len(seq) - 2, -1, -1):
+                a, b = seq[i], seq[i + 1]
+                chain[i] = chain[i + 1] + abs(a[0] - b[0]) + abs(a[1] - b[1])
+            remaining_chain.append(chain)
+
+        def heuristic(order: int, state: PathState) -> int:
+            seq, idx = node_sequences[order], state.seq_idx
+            if idx >= len(seq): return 0
+            goal = seq[idx]
+            return abs(state.pos[0] - goal[0]) + abs(state.pos[1] - goal[1]) + remaining_chain[order][idx]
+
+        open_heap = []
+        tie_breaker = 0
+        g_scores, came_from = {}, {}
+        for order, seq in enumerate(node_sequences):
+            start_pos = seq[0]
+            if not game.board.get_tile(start_pos[0], start_pos[1]): continue
+            start = (order, PathState(pos=start_pos, arrival_dir=None, seq_idx=1))
+            g_scores[start], came_from[start] = 0, None
+            h = heuristic(order, start[1])
+            # Ties on f are broken towards the earlier sequence, then lower h, then insertion order.
+            open_heap.append((h, order, h, tie_breaker, start)); tie_breaker += 1
+        heapq.heapify(open_heap)
+        closed = set()
+        best = None
+
+        while open_heap:
+            f, order, _, _, current = heapq.heappop(open_heap)
+            if best is not None and f > g_scores[best]: break
+            if current in closed: continue
+            closed.add(current)
+            seq, state = node_sequences[order], current[1]
+            if state.seq_idx == len(seq):
+                # Heap order on (f, order) means the first completion popped is the
+                # cheapest, and the earliest sequence among equal costs.
+                best = current
+                break
+
+            previous_target_node = seq[state.seq_idx - 1] if state.seq_idx > 0 else None
+            new_cost = g_scores[current] + 1
+            for successor_state in _get_valid_successors(game, state, seq, previous_target_node):
+                successor = (order, successor_state)
+                if successor in closed: continue
+                if new_cost < g_scores.get(successor, float('inf')):
+                    g_scores[successor], came_from[successor] = new_cost, current
+                    h = heuristic(order, successor_state)
                     tie_breaker += 1
-                    open_set.put((f_score, tie_breaker, successor_state))
-        return None, float('inf')
+                    heapq.heappush(open_heap, (new_cost + h, order, h, tie_breaker, successor))
+
+        visited = {state.pos for _, state in g_scores} or {seq[0] for seq in node_sequences}
+        if best is None: return None, float('inf'), visited
+        return _reconstruct_route(came_from, best, set(node_sequences[best[0]])), g_scores[best], visited
 
 class BFSPathfinder(Pathfinder):
     """Brute-force pathfinder that guarantees the shortest path in number of steps."""
-    def find_path(self, game: 'Game', player: 'Player', full_node_sequence: List[Tuple[int, int]], is_hypothetical: bool = False) -> Tuple[Optional[List[RouteStep]], int]:
-        start_pos = full_node_sequence[0]
-        start_state = PathState(pos=start_pos, arrival_dir=None, seq_idx=1)
-        if not game.board.get_tile(start_pos[0], start_pos[1]): return None, float('inf')
-
-        frontier = deque([start_state])
-        came_from = {start_state: None}
-        cost = {start_state: 0}
-        goal_node_coords = set(full_node_sequence)
+    def _search(self, game: 'Game', node_sequences: List[List[Tuple[int, int]]]) -> Tuple[Optional[List[RouteStep]], int, Set[Tuple[int, int]]]:
+        frontier = deque()
+        came_from, cost = {}, {}
+        for order, seq in enumerate(node_sequences):
+            start_pos = seq[0]
+            if not game.board.get_tile(start_pos[0], start_pos[1]): continue
+            start = (order, PathState(pos=start_pos, arrival_dir=None, seq_idx=1))
+            came_from[start], cost[start] = None, 0
+            frontier.append(start)
 
+        # All sequences share one FIFO, which keeps each sequence's own expansion
+        # order, so every sequence finds the same route it would find on its own.
+        best = None
         while frontier:
-            current_state = frontier.popleft()
-            if current_state.seq_idx == len(full_node_sequence):
-                path: List[RouteStep] = []
-                curr = current_state
-                while curr:
-                    is_goal = curr.pos in goal_node_coords
-                    path.append(RouteStep(curr.pos, is_goal, curr.arrival_dir))
-                    curr = came_from.get(curr)
-                return path[::-1], cost[current_state]
-            
-            previous_target_node = full_node_sequence[current_state.seq_idx - 1] if current_state.seq_idx > 0 else None
-            for successor_state in _get_valid_successors(game, current_state, full_node_sequence, previous_target_node):
-                if successor_state not in came_from:
-                    came_from[successor_state] = current_state
-                    cost[successor_state] = cost[current_state] + 1
-                    frontier.append(successor_state)
-        return None, float('inf')
\ No newline at end of file
+            current = frontier.popleft()
+            current_cost = cost[current]
+            if best is not None and current_cost > cost[best]: break
+            order, state = current
+            seq = node_sequences[order]
+            if state.seq_idx == len(seq):
+                # Keep scanning this depth in case an earlier sequence also completes.
+                if best is None or order < best[0]: best = current
+                if order == 0: break
+                continue
+
+            previous_target_node = seq[state.seq_idx - 1] if state.seq_idx > 0 else None
+            for successor_state in _get_valid_successors(game, state, seq, previous_target_node):
+                successor = (order, successor_state)
+                if successor not in came_from:
+                    came_from[successor] = current
+                    cost[successor] = current_cost + 1
+                    frontier.append(successor)
+
+        visited = {state.pos for _, state in came_from} or {seq[0] for seq in node_sequences}
+        if best is None: return None, float('inf'), visited
+        return _reconstruct_route(came_from, best, set(node_sequences[best[0]])), cost[best], visited
+
+class LegPathfinder(Pathfinder):
+    """
+    Solves a multi-goal route one leg at a time (terminal -> stop A -> stop B -> terminal).
+    Each leg is a BFS from a goal, entered from a given direction, to the next goal
+    and yields the cheapest cost for every direction the next goal can be entered
+    from. A small dynamic programme over (goal, entry direction) joins the legs, so
+    forced exits and is_valid_stop_entry at stop boundaries are respected and the
+    total cost equals the monolithic search. Legs are memoized by start, entry
+    direction and target in a RouteCache, so both terminal orders, repeated
+    evaluations and players sharing buildings reuse them.
+    """
+    def __init__(self):
+        super().__init__()
+        self.leg_cache = RouteCache()
+
+    def _solve_leg(self, game: 'Game', start: Tuple[int, int], arrival_dir: Optional[Direction], goal: Tuple[int, int]) -> Tuple[Dict[Direction, Tuple[int, List[RouteStep]]], Set[Tuple[int, int]]]:
+        """Returns {entry direction at goal: (cost, steps)} for one leg, plus the visited positions."""
+        key = ('leg', start, arrival_dir, goal)
+        if cached := self.leg_cache.lookup(game.board, key):
+            results, visited = cached[0]
+            return results, visited
+
+        leg_sequence = [start, goal]
+        start_state = PathState(pos=start, arrival_dir=arrival_dir, seq_idx=1)
+        results: Dict[Direction, Tuple[int, List[RouteStep]]] = {}
+        came_from, cost = {start_state: None}, {start_state: 0}
+        if game.board.get_cell(start[0], start[1]):
+            # The goal can be entered at most once per port it has, so stop early once
+            # every possible entry direction has a result.
+            max_entries = bin(game.board.get_cell(goal[0], goal[1]) & CELL_PORT_MASK).count('1')
+            frontier = deque([start_state])
+            while frontier and len(results) < max_entries:
+                current_state = frontier.popleft()
+                if current_state.seq_idx == 2:
+                    if current_state.arrival_dir not in results:
+                        steps: List[RouteStep] = []
+                        curr = current_state
+                        while curr:
+                            steps.append(RouteStep(curr.pos, False, curr.arrival_dir))
+                            curr = came_from[curr]
+                        results[current_state.arrival_dir] = (cost[current_state], steps[::-1])
+                    continue
+                for successor_state in _get_valid_successors(game, current_state, leg_sequence, start):
+                    if successor_state not in came_from:
+                        came_from[successor_state] = current_state
+                        cost[successor_state] = cost[current_state] + 1
+                        frontier.append(successor_state)
+
+        visited = {state.pos for state in came_from}
+        self.leg_cache.store(game.board, key, [results, visited], 0, visited)
+        return results, visited
+
+    def _solve_sequence(self, game: 'Game', node_sequence: List[Tuple[int, int]], visited: Set[Tuple[int, int]]) -> Tuple[Optional[List[RouteStep]], int]:
+        # best[entry direction at the current goal] = (total cost, steps so far)
+        best: Dict[Optional[Direction], Tuple[int, List[RouteStep]]] = {None: (0, [])}
+        for i in range(len(node_sequence) - 1):
+            start, goal = node_sequence[i], node_sequence[i + 1]
+            next_best: Dict[Optional[Direction], Tuple[int, List[RouteStep]]] = {}
+            for arrival_dir, (total, steps) in best.items():
+                leg_results, leg_visited = self._solve_leg(game, start, arrival_dir, goal)
+                visited |= leg_visited
+                for entry_dir, (leg_cost, leg_steps) in leg_results.items():
+                    candidate = total + leg_cost
+                    if entry_dir not in next_best or candidate < next_best[entry_dir][0]:
+                        next_best[entry_dir] = (candidate, steps + (leg_steps[1:] if steps else leg_steps))
+            if not next_best: return None, float('inf')
+            best = next_best
+        if len(node_sequence) < 2: return None, float('inf')
+        total, steps = min(best.values(), key=lambda entry: entry[0])
+        goal_node_coords = set(node_sequence)
+        return [RouteStep(step.coord, step.coord in goal_node_coords, step.arrival_direction) for step in steps], total
+
+    def _search(self, game: 'Game', node_sequences: List[List[Tuple[int, int]]]) -> Tuple[Optional[List[RouteStep]], int, Set[Tuple[int, int]]]:
+        visited: Set[Tuple[int, int]] = {seq[0] for seq in node_sequences}
+        best_path, best_cost = None, float('inf')
+        for seq in node_sequences:
+            path, cost = self._solve_sequence(game, seq, visited)
+            if cost < best_cost: best_path, best_cost = path, cost
+        return best_path, best_cost, visited
+
+# Pathfinders selectable per game (see Game.__init__ and DEFAULT_PATHFINDER in constants.py).
+PATHFINDERS = {
+    'bfs': BFSPathfinder,
+    'astar': AStarPathfinder,
+    'legs': LegPathfinder,
+}
+
+def create_pathfinder(name: str) -> Pathfinder:
+    """Creates a pathfinder by name ('bfs', 'astar' or 'legs')."""
+    try:
+        return PATHFINDERS[name.lower()]()
+    except KeyError:
+        raise ValueError(f"Unknown pathfinder '{name}'. Choose from: {', '.join(PATHFINDERS)}")
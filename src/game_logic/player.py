@@ -1,10 +1,14 @@
 # game_logic/player.py
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List, Dict, Tuple, Optional, NamedTuple, TYPE_CHECKING
+from typing import List, Dict, Tuple, Optional, NamedTuple, TYPE_CHECKING, Any
 import pygame
 
 import copy
+import itertools
+import threading
+import time
+import traceback
 
 if TYPE_CHECKING:
     from .game import Game
@@ -14,7 +18,7 @@ if TYPE_CHECKING:
 from .enums import PlayerState, Direction, GamePhase
 from .tile import TileType
 from .cards import LineCard, RouteCard
-from .ai_strategy import AIStrategy, HardStrategy, GreedySequentialStrategy
+from .ai_strategy import AIStrategy, HardStrategy, GreedySequentialStrategy, TranspositionTable, create_strategy, strategy_name
 from .ai_actions import PotentialAction # AI needs to know about the action structure
 import common.constants as C
 from .commands import CombinedActionCommand
@@ -26,6 +30,49 @@ class RouteStep(NamedTuple):
     arrival_direction: Optional[Direction]
 
 
+class LazyComponents(dict):
+    """
+    Mod component store for simulation snapshots. Entries start out shared with the
+    source player and are deep-copied the first time a simulation reads them, so
+    snapshots that never touch a mod's data never pay for copying it.
+    """
+    def __init__(self, source: Dict[str, Any]):
+        super().__init__(source)
+        self._cloned: set = set()
+
+    def _clone(self, key: str) -> Any:
+        value = dict.__getitem__(self, key)
+        if key not in self._cloned:
+            value = copy.deepcopy(value)
+            dict.__setitem__(self, key, value)
+            self._cloned.add(key)
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        return self._clone(key)
+
+    def __setitem__(self, key: str, value: Any):
+        dict.__setitem__(self, key, value)
+        self._cloned.add(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._clone(key) if key in self else default
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self: self[key] = default
+        return self._clone(key)
+
+    def values(self):
+        return [self._clone(k) for k in self]
+
+    def items(self):
+        return [(k, self._clone(k)) for k in self]
+
+    def __reduce__(self):
+        # Pickling (e.g. for worker processes) copies everything anyway.
+        return (LazyComponents, (dict(dict.items(self)),))
+
+
 class Player(ABC):
     def __init__(self, player_id: int, difficulty_mode: str):
         self.player_id = player_id
@@ -68,7 +115,7 @@ class Player(ABC):
         data = { "player_id": self.player_id, "is_ai": isinstance(self, AIPlayer), "hand": [t.name for t in self.hand], "line_card": self.line_card.line_number if self.line_card else None, "route_card": {"stops": self.route_card.stops, "variant": self.route_card.variant_index} if self.route_card else None, "player_state": self.player_state.name, "streetcar_path_index": self.streetcar_path_index, "required_node_index": self.required_node_index, "start_terminal_coord": self.start_terminal_coord, "validated_route": validated_route_data, }
         data['mailbox'] = [t.name for t in self.mailbox]
         if isinstance(self, AIPlayer):
-            data['strategy'] = 'hard' if isinstance(self.strategy, HardStrategy) else 'easy'
+            data['strategy'] = strategy_name(self.strategy)
         data['difficulty_mode'] = self.difficulty_mode
         data['components'] = self.components
         return data
@@ -79,8 +126,7 @@ class Player(ABC):
         player_id = data.get("player_id", -1)
         difficulty_mode = data.get('difficulty_mode', 'normal')
         if is_ai:
-            strategy_name = data.get('strategy', 'easy')
-            strategy = HardStrategy() if strategy_name == 'hard' else EasyStrategy()
+            strategy = create_strategy(data.get('strategy', 'hard'))
             player = AIPlayer(player_id, strategy, difficulty_mode)
         else:
             player = HumanPlayer(player_id, difficulty_mode)
@@ -144,9 +190,15 @@ class Player(ABC):
         return [self.start_terminal_coord] + stop_coords + [end_terminal]
 
     def copy(self) -> 'Player':
-        """Creates a copy of the player for simulation. The hand must be deep-copied."""
+        """
+        Creates a cheap snapshot of the player for simulation. TileTypes are immutable
+        during play, so the hand and mailbox only need new lists; mod components are
+        cloned lazily on first access.
+        """
         new_player = copy.copy(self)
-        new_player.hand = copy.deepcopy(self.hand)
+        new_player.hand = self.hand[:]
+        new_player.mailbox = self.mailbox[:]
+        new_player.components = LazyComponents(self.components)
         return new_player
 
 
@@ -175,6 +227,11 @@ class AIPlayer(Player):
     def __init__(self, player_id: int, strategy: AIStrategy, difficulty_mode: str):
         super().__init__(player_id, difficulty_mode)
         self.strategy = strategy
+        # Token of the background plan this player is waiting for (None when idle).
+        self._pending_plan_token: Optional[int] = None
+        # (token, plan) stored by the planner thread once it finishes, so a turn resumed
+        # after another scene swallowed AI_PLAN_READY_EVENT can still commit it.
+        self._finished_plan: Optional[Tuple[int, List[PotentialAction]]] = None
 
     @property
     def is_ai(self) -> bool:
@@ -184,10 +241,21 @@ class AIPlayer(Player):
         """
         Orchestrates the AI's turn. It gets a plan from a strategy and executes
         the actions within that plan, trusting that the plan is valid.
+        With a visualizer attached, planning runs on a background thread and the
+        plan is committed when AI_PLAN_READY_EVENT arrives (see on_plan_ready), or
+        here on resume if that event went to another scene.
         """
         if game.game_phase == GamePhase.GAME_OVER: return
 
         if self.player_state == PlayerState.LAYING_TRACK:
+            if self._pending_plan_token is not None:
+                finished = self._finished_plan
+                if finished is None or finished[0] != self._pending_plan_token:
+                    return # Already thinking about this turn.
+                # The ready event was consumed elsewhere (e.g. by the main menu); commit the stored plan now.
+                self._commit_finished_plan(game, finished[0], finished[1], sounds)
+                return
+
             if not game.rule_engine.can_player_make_any_move(game, self):
                 print(f"--- Player {self.player_id} has no more legal moves and is ELIMINATED! ---")
                 if sounds: sounds.play('eliminated')
@@ -196,43 +264,16 @@ class AIPlayer(Player):
                 return
             
             print(f"\n--- AI Player {self.player_id} ({self.strategy.__class__.__name__}) is thinking...")
-            final_plan: List[PotentialAction] = []
-            
-            # 1. Get a plan from a mod or the base strategy.
-            mod_plan = game.mod_manager.on_ai_plan_turn(game, self, self.strategy)
-            if mod_plan is not None:
-                final_plan = mod_plan
-            else:
-                print(f"No mod override for AI planning. Using default strategy: {self.strategy.__class__.__name__}")
-                final_plan = self.strategy.plan_turn(game, self)
-            
-            # 2. If the primary strategy failed, attempt the fallback.
-            if not final_plan:
-                print("Primary strategy failed to find a plan. Attempting fallback.")
-                fallback_strategy = GreedySequentialStrategy()
-                final_plan = fallback_strategy.plan_turn(game, self)
 
-            # 3. Execute the final plan or forfeit.
-            if final_plan:
-                print(f"  AI committing its plan...")
-                if visualizer:
-                    visualizer.force_redraw("AI committing moves...")
-                    pygame.time.delay(C.AI_MOVE_DELAY_MS)
-                
-                # Execute every command in the generated plan.
-                # The plan is guaranteed by the AI to have a valid total action cost (e.g., 2).
-                for action in final_plan:
-                    command_to_run = action.command_generator(game, self)
-                    game.command_history.execute_command(command_to_run)
-                
-                # After the plan is fully executed, end the turn.
-                pygame.event.post(pygame.event.Event(C.START_NEXT_TURN_EVENT, {'reason': 'ai_actions_committed'}))
-            else:
-                # If even the fallback strategy failed, the player is truly stuck.
-                print(f"--- AI Player {self.player_id} could not find any valid moves after fallback. Forfeiting turn. ---")
-                if sounds: sounds.play('eliminated')
-                game.eliminate_player(self)
-                pygame.event.post(pygame.event.Event(C.START_NEXT_TURN_EVENT, {'reason': 'ai_forfeit'}))
+            if visualizer and C.AI_ASYNC_PLANNING:
+                self._start_background_planning(game, visualizer)
+                return
+
+            final_plan = self._plan_laying_turn(game, self)
+            if final_plan and visualizer:
+                visualizer.force_redraw("AI committing moves...")
+                pygame.time.delay(C.AI_MOVE_DELAY_MS)
+            self._commit_plan(game, final_plan, sounds)
 
         elif self.player_state == PlayerState.DRIVING:
             print(f"--- AI Player {self.player_id} is in DRIVING phase. ---")
@@ -249,6 +290,118 @@ class AIPlayer(Player):
                 game.attempt_driving_move(self, roll_result, end_turn=True)
 
 
+    def _plan_laying_turn(self, game: 'Game', player: 'AIPlayer') -> List[PotentialAction]:
+        """
+        Gets a plan from a mod or the strategy, falling back to the greedy planner.
+        All of them share this turn's AI_TIME_BUDGET_MS deadline.
+        """
+        self.strategy.start_turn_clock(C.AI_TIME_BUDGET_MS.get(self.difficulty_mode))
+        self.strategy.transposition_table = table = TranspositionTable()
+        try:
+            mod_plan = game.mod_manager.on_ai_plan_turn(game, player, self.strategy)
+            if mod_plan is not None:
+                final_plan = mod_plan
+            else:
+                print(f"No mod override for AI planning. Using default strategy: {self.strategy.__class__.__name__}")
+                final_plan = self.strategy.plan_turn(game, player)
+            
+            # If the primary strategy failed, attempt the fallback.
+            if not final_plan:
+                print("Primary strategy failed to find a plan. Attempting fallback.")
+                fallback_strategy = GreedySequentialStrategy()
+                fallback_strategy.deadline = self.strategy.deadline
+                fallback_strategy.transposition_table = table
+                final_plan = fallback_strategy.plan_turn(game, player)
+            return final_plan
+        finally:
+            self.strategy.start_turn_clock(None)
+            self.strategy.transposition_table = None
+            if table.hits: print(f"  (Transposition table: {table.hits} of {table.hits + table.misses} scores reused)")
+
+    def _commit_plan(self, game: 'Game', final_plan: List[PotentialAction], sounds: Optional['SoundManager']):
+        """Executes the plan through the command history, or forfeits if there is none."""
+        if final_plan:
+            print(f"  AI committing its plan...")
+            # Execute every command in the generated plan.
+            # The plan is guaranteed by the AI to have a valid total action cost (e.g., 2).
+            for action in final_plan:
+                command_to_run = action.command_generator(game, self)
+                game.command_history.execute_command(command_to_run)
+            
+            # After the plan is fully executed, end the turn.
+            pygame.event.post(pygame.event.Event(C.START_NEXT_TURN_EVENT, {'reason': 'ai_actions_committed'}))
+        else:
+            # If even the fallback strategy failed, the player is truly stuck.
+            print(f"--- AI Player {self.player_id} could not find any valid moves after fallback. Forfeiting turn. ---")
+            if sounds: sounds.play('eliminated')
+            game.eliminate_player(self)
+            pygame.event.post(pygame.event.Event(C.START_NEXT_TURN_EVENT, {'reason': 'ai_forfeit'}))
+
+    def _start_background_planning(self, game: 'Game', visualizer: 'GameScene'):
+        """
+        Plans on a snapshot of the game in a daemon thread so the scene keeps drawing.
+        The thread waits out whatever is left of AI_MOVE_DELAY_MS, then posts the plan.
+        """
+        token = next(_plan_tokens)
+        self._pending_plan_token = token
+        self._finished_plan = None
+        sim_game = game.copy_for_simulation(detach_mods=True)
+        sim_game.pathfinder = game.pathfinder.fork()
+        sim_player = next(p for p in sim_game.players if p.player_id == self.player_id)
+        started = time.monotonic()
+
+        def plan_in_background():
+            try:
+                plan = self._plan_laying_turn(sim_game, sim_player)
+            except Exception:
+                traceback.print_exc()
+                plan = []
+            remaining = C.AI_MOVE_DELAY_MS / 1000.0 - (time.monotonic() - started)
+            if remaining > 0: time.sleep(remaining)
+            self._finished_plan = (token, plan)
+            pygame.event.post(pygame.event.Event(C.AI_PLAN_READY_EVENT, {'player_id': self.player_id, 'token': token, 'plan': plan}))
+
+        threading.Thread(target=plan_in_background, name=f"ai-planner-{self.player_id}", daemon=True).start()
+        if visualizer.current_state and hasattr(visualizer.current_state, 'message'):
+            visualizer.current_state.message = "AI is thinking..."
+
+    def on_plan_ready(self, game: 'Game', event: pygame.event.Event, sounds: Optional['SoundManager'] = None) -> bool:
+        """Commits a background plan on the main thread. Stale or foreign plans are ignored."""
+        return self._commit_finished_plan(game, event.token, event.plan, sounds)
+
+    def _commit_finished_plan(self, game: 'Game', token: int, plan: List[PotentialAction], sounds: Optional['SoundManager']) -> bool:
+        if token != self._pending_plan_token: return False
+        self._pending_plan_token = None
+        self._finished_plan = None
+        if game.game_phase == GamePhase.GAME_OVER or self.player_state != PlayerState.LAYING_TRACK: return False
+        if game.get_active_player() is not self: return False
+        if not self._plan_still_applies(game, plan):
+            # The live game moved on from the snapshot the plan was made on; plan again here.
+            print(f"  Background plan for Player {self.player_id} no longer applies. Replanning...")
+            plan = self._plan_laying_turn(game, self)
+        self._commit_plan(game, plan, sounds)
+        return True
+
+    def _plan_still_applies(self, game: 'Game', plan: List[PotentialAction]) -> bool:
+        """True if no action was taken this turn and every action is still legal, in order, on the live board."""
+        if game.actions_taken_this_turn != 0: return False
+        rule_engine, deltas = game.rule_engine, []
+        try:
+            for action in plan:
+                d = action.details
+                if 'tile' in d and d['tile'] not in self.hand: return False
+                if action.action_type == 'place' and not rule_engine.check_placement_validity(game, d['tile'], d['orientation'], *d['coord'])[0]: return False
+                if action.action_type == 'exchange' and not rule_engine.check_exchange_validity(game, self, d['tile'], d['orientation'], *d['coord'])[0]: return False
+                deltas.append(self.strategy._make_action(game, self, action))
+            return True
+        finally:
+            for delta in reversed(deltas):
+                self.strategy._unmake_action(game, self, delta)
+
+
+_plan_tokens = itertools.count(1)
+
+
 # HELPERS
 def _ai_wants_to_use_influence(game: 'Game', player: 'AIPlayer') -> bool:
     """Helper logic to determine if an AI should spend an Influence point."""
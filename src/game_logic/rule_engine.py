@@ -1,7 +1,6 @@
 # game_logic/rule_engine.py
 from __future__ import annotations
-from typing import TYPE_CHECKING, Tuple, List, Dict, Optional
-import copy
+from typing import TYPE_CHECKING, Tuple, List, Dict, Optional, Mapping
 
 if TYPE_CHECKING:
     from .game import Game
@@ -9,65 +8,60 @@ if TYPE_CHECKING:
     from .tile import TileType, PlacedTile
 
 from .enums import Direction, GamePhase, PlayerState
+from .tile import PORT_BITS
+from .board import encode_tile_type, CELL_STOP, CELL_ADJACENCY_SHIFT, STATIC_PLAYABLE, STATIC_BUILDING
 from states.game_states import GameOverState
 
+# (dr, dc) for N, E, S, W, matching the port indices of the compact cell encoding.
+_DIRECTION_DELTAS: Tuple[Tuple[int, int], ...] = tuple(d.value for d in Direction)
+# Adjacency bits for the straight N<->S and E<->W segments stop signs are placed on.
+_NS_STRAIGHT = PORT_BITS['S'] << (4 * 0)
+_EW_STRAIGHT = PORT_BITS['W'] << (4 * 1)
+
 class RuleEngine:
     """A stateless service that contains all the core validation logic for the game."""
     
-    def _rotate_direction(self, direction: str, angle: int) -> str:
-        directions = ['N', 'E', 'S', 'W']
-        current_index = directions.index(direction)
-        steps = (angle % 360) // 90
-        return directions[(current_index + steps) % 4]
-
-    def get_effective_connections(self, tile_type: 'TileType', orientation: int) -> Dict[str, List[str]]:
-        if orientation == 0:
-            return copy.deepcopy(tile_type.connections_base)
-        rotated_connections: Dict[str, List[str]] = {'N': [], 'E': [], 'S': [], 'W': []}
-        for base_entry, base_exits in tile_type.connections_base.items():
-            actual_entry = self._rotate_direction(base_entry, orientation)
-            rotated_connections[actual_entry] = [self._rotate_direction(ex, orientation) for ex in base_exits]
-            rotated_connections[actual_entry].sort()
-        return rotated_connections
-
-    def _get_hypothetical_tile(self, game: 'Game', r: int, c: int, hypothetical_moves: Optional[List[Dict]] = None) -> Optional['PlacedTile']:
-        from .tile import PlacedTile
+    def get_effective_connections(self, tile_type: 'TileType', orientation: int) -> Mapping[str, Tuple[str, ...]]:
+        """Returns the read-only connection map for a tile type at the given orientation."""
+        return tile_type.rotated_connections[(orientation % 360) // 90]
+
+    def get_connected_ports(self, tile_type: 'TileType', orientation: int) -> Tuple[str, ...]:
+        """Returns the sides ('N', 'E', 'S', 'W') that carry track at the given orientation."""
+        return tile_type.rotated_ports[(orientation % 360) // 90]
+
+    def _get_hypothetical_cell(self, game: 'Game', r: int, c: int, hypothetical_moves: Optional[List[Dict]] = None) -> int:
+        """Returns the compact cell value at (r, c), honouring any staged hypothetical moves."""
         if hypothetical_moves:
             for move in hypothetical_moves:
                 if move['coord'] == (r, c):
-                    return PlacedTile(move['tile_type'], move['orientation'])
-        return game.board.get_tile(r, c)
+                    return encode_tile_type(move['tile_type'], move['orientation'])
+        return game.board.get_cell(r, c)
 
     def check_placement_validity(self, game: 'Game', tile_type: 'TileType', orientation: int, r: int, c: int, hypothetical_moves: Optional[List[Dict]] = None) -> Tuple[bool, str]:
-        if not game.board.is_playable_coordinate(r, c) or game.board.get_tile(r, c) or game.board.get_building_at(r, c):
+        board = game.board
+        if board.get_cell(r, c) or board.get_static(r, c) & (STATIC_PLAYABLE | STATIC_BUILDING) != STATIC_PLAYABLE:
             return False, "Target square is not empty and playable on the real board."
 
-        # --- START OF FIX ---
-        # Call the method on 'self' (the RuleEngine instance), not on 'game'.
-        new_connections = self.get_effective_connections(tile_type, orientation)
-        # --- END OF FIX ---
+        new_ports = tile_type.rotated_port_masks[(orientation % 360) // 90]
 
-        for direction in Direction:
-            has_outgoing_track = any(direction.name in exits for exits in new_connections.values())
-            nr, nc = r + direction.value[0], c + direction.value[1]
+        for i, (dr, dc) in enumerate(_DIRECTION_DELTAS):
+            has_outgoing_track = (new_ports >> i) & 1
+            nr, nc = r + dr, c + dc
             
-            neighbor_tile = self._get_hypothetical_tile(game, nr, nc, hypothetical_moves)
+            neighbor_cell = self._get_hypothetical_cell(game, nr, nc, hypothetical_moves)
             
-            if neighbor_tile:
-                # --- START OF FIX ---
-                neighbor_connections = self.get_effective_connections(neighbor_tile.tile_type, neighbor_tile.orientation)
-                # --- END OF FIX ---
-                required_neighbor_exit = Direction.opposite(direction).name
-                neighbor_has_incoming_track = any(required_neighbor_exit in exits for exits in neighbor_connections.values())
+            if neighbor_cell:
+                # The neighbour must carry track on the side facing us (port index i + 2).
+                neighbor_has_incoming_track = (neighbor_cell >> ((i + 2) % 4)) & 1
                 
                 if has_outgoing_track != neighbor_has_incoming_track:
                     return False, f"Connection mismatch with tile at ({nr},{nc})."
-            else:
-                if has_outgoing_track:
-                    if not game.board.is_playable_coordinate(nr, nc):
-                        return False, f"Track points into a wall at ({nr},{nc})."
-                    if game.board.get_building_at(nr, nc):
-                        return False, f"Track points into a building at ({nr},{nc})."
+            elif has_outgoing_track:
+                neighbor_static = board.get_static(nr, nc)
+                if not neighbor_static & STATIC_PLAYABLE:
+                    return False, f"Track points into a wall at ({nr},{nc})."
+                if neighbor_static & STATIC_BUILDING:
+                    return False, f"Track points into a building at ({nr},{nc})."
         
         return True, "Placement is valid."
     
@@ -78,39 +72,97 @@ class RuleEngine:
         if new_tile_type not in player.hand: return False, "Player does not have tile."
         if old_tile.tile_type == new_tile_type: return False, "Cannot replace with same type."
 
-        # --- START OF FIX ---
-        old_conns = self.get_effective_connections(old_tile.tile_type, old_tile.orientation)
-        new_conns = self.get_effective_connections(new_tile_type, new_orientation)
-        # --- END OF FIX ---
-        
-        def get_connection_set(conn_map: Dict[str, List[str]]) -> set:
-            return {frozenset([entry, exit]) for entry, exits in conn_map.items() for exit in exits}
+        old_adjacency = old_tile.tile_type.rotated_adjacency[(old_tile.orientation % 360) // 90]
+        new_adjacency = new_tile_type.rotated_adjacency[(new_orientation % 360) // 90]
 
-        if not get_connection_set(old_conns).issubset(get_connection_set(new_conns)):
+        if old_adjacency & ~new_adjacency:
             return False, "Connection Preservation Failed."
 
-        added_connections = get_connection_set(new_conns) - get_connection_set(old_conns)
-        for conn_pair in added_connections:
-            dir1_str, dir2_str = list(conn_pair)
-            for exit_dir_str in [dir1_str, dir2_str]:
-                exit_dir_enum = Direction.from_str(exit_dir_str)
-                nr, nc = r + exit_dir_enum.value[0], c + exit_dir_enum.value[1]
-                
-                neighbor_tile = self._get_hypothetical_tile(game, nr, nc, hypothetical_moves)
-                
-                if neighbor_tile:
-                    # --- START OF FIX ---
-                    neighbor_conns = self.get_effective_connections(neighbor_tile.tile_type, neighbor_tile.orientation)
-                    # --- END OF FIX ---
-                    required_neighbor_exit = Direction.opposite(exit_dir_enum).name
-                    if not any(required_neighbor_exit in exits for exits in neighbor_conns.values()):
-                        return False, f"New connection to ({nr},{nc}) invalid."
-                else:
-                    if not game.board.is_playable_coordinate(nr, nc): return False, f"New connection to wall at ({nr},{nc})."
-                    if game.board.get_building_at(nr, nc): return False, f"New connection to building at ({nr},{nc})."
+        # Every side touched by a newly added connection must lead somewhere valid.
+        added_adjacency = new_adjacency & ~old_adjacency
+        for i, (dr, dc) in enumerate(_DIRECTION_DELTAS):
+            if not (added_adjacency >> (4 * i)) & 0xF:
+                continue
+            nr, nc = r + dr, c + dc
+            
+            neighbor_cell = self._get_hypothetical_cell(game, nr, nc, hypothetical_moves)
+            
+            if neighbor_cell:
+                if not (neighbor_cell >> ((i + 2) % 4)) & 1:
+                    return False, f"New connection to ({nr},{nc}) invalid."
+            else:
+                neighbor_static = game.board.get_static(nr, nc)
+                if not neighbor_static & STATIC_PLAYABLE: return False, f"New connection to wall at ({nr},{nc})."
+                if neighbor_static & STATIC_BUILDING: return False, f"New connection to building at ({nr},{nc})."
 
         return True, "Exchange is valid."
 
+    def _neighbour_constraints(self, board, r: int, c: int) -> Tuple[int, int]:
+        """
+        Side masks (bit i = direction i) for a square: 'required' sides face a neighbour
+        with track towards us, 'blocked' sides face a tile without such track, a wall
+        or a building. A tile's track must cover every required side and no blocked one.
+        """
+        required = blocked = 0
+        for i, (dr, dc) in enumerate(_DIRECTION_DELTAS):
+            nr, nc = r + dr, c + dc
+            neighbor_cell = board.get_cell(nr, nc)
+            if neighbor_cell:
+                if (neighbor_cell >> ((i + 2) % 4)) & 1: required |= 1 << i
+                else: blocked |= 1 << i
+            elif board.get_static(nr, nc) & (STATIC_PLAYABLE | STATIC_BUILDING) != STATIC_PLAYABLE:
+                blocked |= 1 << i
+        return required, blocked
+
+    def get_placement_masks(self, game: 'Game', tile_types: List['TileType'], coords: List[Tuple[int, int]]) -> List[List[int]]:
+        """
+        Batch form of check_placement_validity over every (square, tile, orientation).
+        Returns one row per coord with one 4-bit mask per tile type; bit k set means
+        the placement at orientation k * 90 is legal. Neighbour constraints are
+        computed once per square and each orientation is two mask tests.
+        """
+        board = game.board
+        result = []
+        for r, c in coords:
+            if board.get_cell(r, c) or board.get_static(r, c) & (STATIC_PLAYABLE | STATIC_BUILDING) != STATIC_PLAYABLE:
+                result.append([0] * len(tile_types))
+                continue
+            required, blocked = self._neighbour_constraints(board, r, c)
+            row = []
+            for tile_type in tile_types:
+                mask = 0
+                for steps, ports in enumerate(tile_type.rotated_port_masks):
+                    if ports & required == required and not ports & blocked:
+                        mask |= 1 << steps
+                row.append(mask)
+            result.append(row)
+        return result
+
+    def get_exchange_masks(self, game: 'Game', player: 'Player', tile_types: List['TileType'], coords: List[Tuple[int, int]]) -> List[List[int]]:
+        """Batch form of check_exchange_validity, laid out like get_placement_masks."""
+        board = game.board
+        result = []
+        for r, c in coords:
+            old_tile = board.get_tile(r, c)
+            if not old_tile or not old_tile.tile_type.is_swappable or old_tile.has_stop_sign or old_tile.is_terminal:
+                result.append([0] * len(tile_types))
+                continue
+            old_adjacency = old_tile.tile_type.rotated_adjacency[(old_tile.orientation % 360) // 90]
+            blocked = self._neighbour_constraints(board, r, c)[1]
+            row = []
+            for tile_type in tile_types:
+                mask = 0
+                if tile_type in player.hand and tile_type != old_tile.tile_type:
+                    for steps, new_adjacency in enumerate(tile_type.rotated_adjacency):
+                        if old_adjacency & ~new_adjacency: continue
+                        # Sides (entry nibbles) that gain a connection must not be blocked.
+                        added_adjacency = new_adjacency & ~old_adjacency
+                        if not any((added_adjacency >> (4 * i)) & 0xF for i in range(4) if (blocked >> i) & 1):
+                            mask |= 1 << steps
+                row.append(mask)
+            result.append(row)
+        return result
+
     def check_win_condition(self, game: 'Game', player: 'Player') -> bool:
         if player.player_state != PlayerState.DRIVING or not player.streetcar_position or not player.line_card:
             return False
@@ -129,18 +181,17 @@ class RuleEngine:
             return True
         return False
 
-    def check_and_place_stop_sign(self, game: 'Game', placed_tile: 'PlacedTile', row: int, col: int):
+    def check_and_place_stop_sign(self, game: 'Game', placed_tile: 'PlacedTile', row: int, col: int, announce: bool = True) -> Optional[str]:
         """
         Checks if a newly placed tile creates a stop sign for an adjacent
         building and updates the board state if it does.
+        Returns the id of the building that received the stop, or None.
+        announce=False keeps AI simulations quiet.
         """
         if game.board.get_tile(row, col) != placed_tile:
-            return
+            return None
 
-        def has_ns_straight(conns): return 'S' in conns.get('N', [])
-        def has_ew_straight(conns): return 'W' in conns.get('E', [])
-
-        tile_connections = self.get_effective_connections(placed_tile.tile_type, placed_tile.orientation)
+        adjacency = game.board.get_cell(row, col) >> CELL_ADJACENCY_SHIFT
 
         for direction in Direction:
             dr, dc = direction.value
@@ -151,34 +202,30 @@ class RuleEngine:
             building_id = game.board.get_building_at(nr, nc)
             if building_id and building_id not in game.board.buildings_with_stops:
                 is_parallel = False
-                if direction in [Direction.N, Direction.S] and has_ew_straight(tile_connections):
+                if direction in [Direction.N, Direction.S] and adjacency & _EW_STRAIGHT:
                     is_parallel = True
-                if direction in [Direction.E, Direction.W] and has_ns_straight(tile_connections):
+                if direction in [Direction.E, Direction.W] and adjacency & _NS_STRAIGHT:
                     is_parallel = True
                 
                 if is_parallel:
-                    placed_tile.has_stop_sign = True
-                    game.board.buildings_with_stops.add(building_id)
-                    game.board.building_stop_locations[building_id] = (row, col)
-                    print(f"--> Placed stop sign at ({row},{col}) for Building {building_id}.")
-                    break # A tile can only create one stop sign
+                    game.board.set_stop_sign(row, col, building_id)
+                    if announce: print(f"--> Placed stop sign at ({row},{col}) for Building {building_id}.")
+                    return building_id # A tile can only create one stop sign
+        return None
 
     def is_valid_stop_entry(self, game: 'Game', stop_coord: Tuple[int, int], entry_direction: Direction) -> bool:
         """
         Checks if a tram arriving at a stop tile is doing so on the correct
         (parallel) track segment.
         """
-        placed_tile = game.board.get_tile(stop_coord[0], stop_coord[1])
-        if not placed_tile or not placed_tile.has_stop_sign:
+        cell = game.board.get_cell(stop_coord[0], stop_coord[1])
+        if not cell & CELL_STOP:
             return False
 
-        def has_ns_straight(conns): return 'S' in conns.get('N', [])
-        def has_ew_straight(conns): return 'W' in conns.get('E', [])
-        
-        tile_conns = self.get_effective_connections(placed_tile.tile_type, placed_tile.orientation)
+        adjacency = cell >> CELL_ADJACENCY_SHIFT
         
         # Find the building associated with this stop
-        building_id = next((bid for bid, bcoord in game.board.building_stop_locations.items() if bcoord == stop_coord), None)
+        building_id = game.board.stop_coord_to_building.get(stop_coord)
         if not building_id: return False
         
         building_pos = game.board.building_coords.get(building_id)
@@ -187,27 +234,45 @@ class RuleEngine:
         # If the building is North/South of the stop tile, the track must be East/West
         is_building_ns = building_pos[1] == stop_coord[1]
         if is_building_ns:
-            return has_ew_straight(tile_conns) and entry_direction in [Direction.E, Direction.W]
+            return bool(adjacency & _EW_STRAIGHT) and entry_direction in [Direction.E, Direction.W]
         else: # Building is East/West, so track must be North/South
-            return has_ns_straight(tile_conns) and entry_direction in [Direction.N, Direction.S]
+            return bool(adjacency & _NS_STRAIGHT) and entry_direction in [Direction.N, Direction.S]
 
     def can_player_make_any_move(self, game: 'Game', player: 'Player') -> bool:
         """
-        Performs an exhaustive check to see if a player has any possible legal move.
+        Checks whether a player has any possible legal move, using the board's move
+        index so only frontier, isolated and exchangeable cells are examined.
         This now also checks all economic actions available from mods.
         """
-        print(f"--- Performing exhaustive move check for Player {player.player_id}... ---")
-        # Check for standard placement/exchange moves
-        for tile in set(player.hand):
-            for r in range(game.board.rows):
-                for c in range(game.board.cols):
-                    for o in [0, 90, 180, 270]:
-                        if self.check_placement_validity(game, tile, o, r, c)[0]:
-                            print(f"  (Found possible move: Place {tile.name} at ({r},{c}))")
-                            return True
-                        if self.check_exchange_validity(game, player, tile, o, r, c)[0]:
-                            print(f"  (Found possible move: Exchange for {tile.name} at ({r},{c}))")
-                            return True
+        print(f"--- Performing move check for Player {player.player_id}... ---")
+        board = game.board
+        frontier_cells, isolated_cells_by_mask, exchangeable_cells = board.get_move_index()
+        hand_tiles = set(player.hand)
+
+        # Isolated cells only constrain which sides may carry track.
+        open_masks = [mask for mask, cells in enumerate(isolated_cells_by_mask) if cells]
+        for tile in hand_tiles:
+            for ports in set(tile.rotated_port_masks):
+                if any(not ports & ~mask for mask in open_masks):
+                    print(f"  (Found possible move: Place {tile.name} on an open square)")
+                    return True
+
+        # Squares next to existing track need the full connection check.
+        for idx in frontier_cells:
+            r, c = divmod(idx, board.cols)
+            for tile in hand_tiles:
+                for o in [0, 90, 180, 270]:
+                    if self.check_placement_validity(game, tile, o, r, c)[0]:
+                        print(f"  (Found possible move: Place {tile.name} at ({r},{c}))")
+                        return True
+
+        for idx in exchangeable_cells:
+            r, c = divmod(idx, board.cols)
+            for tile in hand_tiles:
+                for o in [0, 90, 180, 270]:
+                    if self.check_exchange_validity(game, player, tile, o, r, c)[0]:
+                        print(f"  (Found possible move: Exchange for {tile.name} at ({r},{c}))")
+                        return True
 
         # Ask the mod manager if any mod provides a valid action for the AI
         if player.is_ai and game.mod_manager.on_ai_plan_turn(game, player, player.strategy):
@@ -216,4 +281,4 @@ class RuleEngine:
         
 
         print("  (No possible moves found for this player.)")
-        return False
\ No newline at end of file
+        return False
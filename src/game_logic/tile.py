@@ -1,9 +1,15 @@
 # game_logic/tile.py
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple, FrozenSet, Mapping
+from types import MappingProxyType
 import copy
 # Assuming constants like TILE_DEFINITIONS might be needed here or passed in
 # If constants are needed, import them: from constants import ...
 
+# Bitmask encoding of tile sides. The index of a side matches the order of the
+# Direction enum (N, E, S, W), so PORT_BITS[i] == 1 << i.
+PORT_ORDER: Tuple[str, ...] = ('N', 'E', 'S', 'W')
+PORT_BITS: Dict[str, int] = {d: 1 << i for i, d in enumerate(PORT_ORDER)}
+
 class TileType:
     def __init__(self, name: str, connections: List[List[str]], is_swappable: bool, **kwargs):
         """
@@ -18,12 +24,68 @@ class TileType:
         self.name = name
         self.connections_base = self._process_connections(connections)
         self.is_swappable = is_swappable
+        self._build_rotation_table()
 
     def copy(self) -> 'TileType':
         """Creates a deep copy of this TileType object."""
         # We can use Python's built-in copy module for a true deep copy.
         return copy.deepcopy(self)
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'TileType':
+        # The rotation tables are immutable, so copies can share them.
+        new_tile = object.__new__(self.__class__)
+        new_tile.__dict__.update(self.__dict__)
+        memo[id(self)] = new_tile
+        new_tile.connections_base = copy.deepcopy(self.connections_base, memo)
+        return new_tile
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Mapping proxies cannot be pickled; the tables are rebuilt in __setstate__.
+        state = self.__dict__.copy()
+        for key in ('rotated_connections', 'rotated_ports', 'rotated_pairs', 'rotated_port_masks', 'rotated_adjacency'):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._build_rotation_table()
+
+    def _build_rotation_table(self):
+        """
+        Precomputes the read-only connection data for all four orientations, indexed
+        by (orientation % 360) // 90. The rule engine, pathfinder and AI read from
+        these tables instead of rotating connections_base on every call.
+        """
+        directions = list(PORT_ORDER)
+        rotated_connections, rotated_ports, rotated_pairs = [], [], []
+        rotated_port_masks, rotated_adjacency = [], []
+        for steps in range(4):
+            rotate = lambda d: directions[(directions.index(d) + steps) % 4]
+            conn_map: Dict[str, Tuple[str, ...]] = {'N': (), 'E': (), 'S': (), 'W': ()}
+            for base_entry, base_exits in self.connections_base.items():
+                conn_map[rotate(base_entry)] = tuple(sorted(rotate(ex) for ex in base_exits))
+            rotated_connections.append(MappingProxyType(conn_map))
+            rotated_ports.append(tuple(d for d in directions if conn_map[d]))
+            rotated_pairs.append(frozenset(frozenset((entry, ex)) for entry, exits in conn_map.items() for ex in exits))
+
+            # 4-bit mask of sides with track, and a 16-bit entry->exit adjacency where
+            # bits [4*i, 4*i+3] hold the exit mask reachable from side i.
+            port_mask, adjacency = 0, 0
+            for i, entry in enumerate(directions):
+                exit_mask = 0
+                for ex in conn_map[entry]:
+                    exit_mask |= PORT_BITS[ex]
+                if exit_mask:
+                    port_mask |= PORT_BITS[entry]
+                adjacency |= exit_mask << (4 * i)
+            rotated_port_masks.append(port_mask)
+            rotated_adjacency.append(adjacency)
+        self.rotated_connections: Tuple[Mapping[str, Tuple[str, ...]], ...] = tuple(rotated_connections)
+        self.rotated_ports: Tuple[Tuple[str, ...], ...] = tuple(rotated_ports)
+        self.rotated_pairs: Tuple[FrozenSet[FrozenSet[str]], ...] = tuple(rotated_pairs)
+        self.rotated_port_masks: Tuple[int, ...] = tuple(rotated_port_masks)
+        self.rotated_adjacency: Tuple[int, ...] = tuple(rotated_adjacency)
+
     def _process_connections(self, raw_connections: List[List[str]]) -> Dict[str, List[str]]:
         """Processes raw connection pairs into a two-way connection map."""
         conn_map: Dict[str, List[str]] = {'N': [], 'E': [], 'S': [], 'W': []}
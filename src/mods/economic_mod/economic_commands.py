@@ -116,12 +116,8 @@ class SellToScrapyardCommand(Command):
             return False
 
         try:
-            if self.game.deck_manager.tile_draw_pile[0] == self.tile_to_sell:
-                tile_to_return = self.game.deck_manager.tile_draw_pile.pop(0)
-                self.player.hand.append(tile_to_return)
-            else:
-                self.game.deck_manager.tile_draw_pile.remove(self.tile_to_sell)
-                self.player.hand.append(self.tile_to_sell)
+            self.game.deck_manager.tile_draw_pile.remove(self.tile_to_sell)
+            self.player.hand.append(self.tile_to_sell)
 
             capital_pool = self.player.components.get(self.mod_id)
             if capital_pool:
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, List, Dict, Any, Optional, Set, Tuple
 from collections import Counter
 
 import random
+import dataclasses
 
 from game_logic.player import _ai_wants_to_use_influence
 
@@ -35,6 +36,41 @@ if TYPE_CHECKING:
 
 # A unique identifier for our special tile's name
 REQUISITION_PERMIT_ID = "REQUISITION_PERMIT"
+# AI action types that change the board; the rest only move capital or hand tiles.
+BOARD_ACTIONS = ('place', 'exchange')
+
+class _PlacementPool:
+    """
+    Legal place/exchange actions per tile type on one AI turn's target squares.
+    Legality and scoring don't depend on which hand holds a tile, so each type is
+    gathered once (with a one-tile hand) and any hand's candidates are assembled
+    from the per-type lists in _gather_standard_actions' own order.
+    """
+    def __init__(self, game: 'Game', player: 'AIPlayer', base_strategy: 'AIStrategy', ideal_plan, target_squares):
+        self.game, self.player, self.base_strategy = game, player, base_strategy
+        self.ideal_plan, self.target_squares = ideal_plan, target_squares
+        self.coord_index = {coord: k for k, coord in enumerate(target_squares)}
+        self.by_tile: Dict['TileType', List[PotentialAction]] = {}
+
+    def for_tile(self, tile: 'TileType') -> List[PotentialAction]:
+        if tile not in self.by_tile:
+            sim_player = self.player.copy()
+            sim_player.hand = [tile]
+            self.by_tile[tile] = self.base_strategy._gather_standard_actions(self.game, sim_player, self.ideal_plan, self.target_squares)
+        return self.by_tile[tile]
+
+    def gather(self, hand: List['TileType']) -> List[PotentialAction]:
+        """Same actions, in the same order, as _gather_standard_actions for a player holding hand."""
+        merged = []
+        for tile_pos, tile in enumerate(list(set(hand))):
+            for pos, action in enumerate(self.for_tile(tile)):
+                merged.append((self.coord_index[action.details['coord']], tile_pos, pos, action))
+        merged.sort(key=lambda entry: entry[:3])
+        return [entry[3] for entry in merged]
+
+    def has_moves(self, hand: List['TileType']) -> bool:
+        return any(self.for_tile(tile) for tile in set(hand))
+
 
 class EconomicMod(IMod):
     """A mod that introduces Capital and market forces to the railway expansion."""
@@ -55,6 +91,7 @@ class EconomicMod(IMod):
             }
         self.headline_manager = HeadlineManager()
         self.headline_manager.event_trigger_threshold = 2
+        self._track_market(game)
 
     def on_player_turn_start(self, game: 'Game', player: 'Player'):
         """
@@ -252,7 +289,7 @@ class EconomicMod(IMod):
         )
 
 
-    def _find_best_permit_fulfillment_action(self, game: 'Game', player: 'AIPlayer', base_strategy: 'AIStrategy', ideal_plan, target_squares) -> Optional[PotentialAction]:
+    def _find_best_permit_fulfillment_action(self, game: 'Game', player: 'AIPlayer', base_strategy: 'AIStrategy', ideal_plan, target_squares, pool: Optional[_PlacementPool] = None) -> Optional[PotentialAction]:
         """
         Simulates using a permit to find the single best tile to acquire and place.
         
@@ -268,9 +305,10 @@ class EconomicMod(IMod):
 
         best_future_action = None
         highest_net_gain = 0
+        if pool is None: pool = _PlacementPool(game, player, base_strategy, ideal_plan, target_squares)
 
         # Simulate buying each affordable tile type from the supply
-        for tile_type in set(game.deck_manager.tile_draw_pile):
+        for tile_type in game.deck_manager.tile_draw_pile.types():
             tile_market_price = self.get_market_price(game, tile_type)
             total_cost = permit_cost + tile_market_price
             
@@ -288,7 +326,7 @@ class EconomicMod(IMod):
                 if not permit_found: continue # Should not happen if this function is called correctly
 
                 # Find the best placement for this newly acquired tile
-                possible_placements = base_strategy._gather_standard_actions(game, sim_player, ideal_plan, target_squares)
+                possible_placements = pool.gather(sim_player.hand)
                 if not possible_placements: continue
 
                 best_placement = max(possible_placements, key=lambda p: p.score)
@@ -299,7 +337,8 @@ class EconomicMod(IMod):
                 if net_gain > highest_net_gain:
                     highest_net_gain = net_gain
                     # The action we care about is the final placement, but we store the cost
-                    best_future_action = best_placement
+                    # (on a copy, since pooled actions are shared across this turn's searches)
+                    best_future_action = dataclasses.replace(best_placement, details=dict(best_placement.details))
                     # We can store the cost in the action itself for later reference if needed
                     best_future_action.details['total_permit_cost'] = total_cost
         
@@ -319,8 +358,10 @@ class EconomicMod(IMod):
 
         # 1. Gather all possible 1-action moves. Crucially, the placement scoring
         #    now comes directly from the base strategy, including the +5000 stop bonus.
-        placements = base_strategy._gather_standard_actions(game, player, ideal_plan, target_squares)
-        economics = self._get_economic_actions(game, player, ideal_plan, target_squares, base_strategy)
+        # Legal placements are gathered once per tile type and shared by every sub-search below.
+        pool = _PlacementPool(game, player, base_strategy, ideal_plan, target_squares)
+        placements = pool.gather(player.hand)
+        economics = self._get_economic_actions(game, player, ideal_plan, target_squares, base_strategy, pool)
         one_action_moves = placements + economics
 
         # This list will hold every valid 2-action plan the AI can make.
@@ -344,22 +385,48 @@ class EconomicMod(IMod):
         if not all_possible_turns:
             return []
 
-        # 5. Score every valid plan and choose the best one.
-        best_plan = None
-        best_score = -1.0
-
-        for plan in all_possible_turns:
-            sim_game = game.copy_for_simulation()
-            sim_player = next(p for p in sim_game.players if p.player_id == player.player_id)
-            for action in plan:
-                base_strategy._apply_potential_action_to_sim(sim_game, sim_player, action)
-            
+        # 5. Score every valid plan and choose the best one (best-first under the AI's time budget).
+        #    Plans form a prefix tree on their first action: the search takes each first
+        #    action's plans back to back, so it stays applied while its children are
+        #    evaluated, and a plan whose later actions only move capital or hand tiles
+        #    reuses that first action's board score (computed once, on first use).
+        base_board_score = base_strategy._score_board_state(game, player)
+        prefix = {'action': None, 'delta': None}
+        prefix_scores: Dict[int, float] = {}
+
+        def apply_prefix(action):
+            if prefix['action'] is action: return
+            if prefix['delta'] is not None:
+                base_strategy._unmake_action(game, player, prefix['delta'])
+            prefix['action'], prefix['delta'] = action, base_strategy._make_action(game, player, action)
+
+        def score_plan(plan):
             # The score is the quality of the final board state plus the actions' inherent scores.
-            current_plan_score = base_strategy._score_board_state(sim_game, sim_player) + sum(a.score for a in plan)
-
-            if current_plan_score > best_score:
-                best_score = current_plan_score
-                best_plan = plan
+            first, rest = plan[0], plan[1:]
+            apply_prefix(first)
+            inherent = sum(a.score for a in plan)
+            if not any(a.action_type in BOARD_ACTIONS for a in rest):
+                if id(first) not in prefix_scores:
+                    prefix_scores[id(first)] = base_strategy._score_board_state(game, player) if first.action_type in BOARD_ACTIONS else base_board_score
+                return prefix_scores[id(first)] + inherent
+            deltas = []
+            try:
+                for action in rest:
+                    deltas.append(base_strategy._make_action(game, player, action))
+                return base_strategy._score_board_state(game, player) + inherent
+            finally:
+                for delta in reversed(deltas):
+                    base_strategy._unmake_action(game, player, delta)
+
+        local_score, route_bound, deltas = base_strategy._score_local_board(game), base_strategy._route_score_bound(game, player), {}
+        try:
+            best_score, best_plan = base_strategy._search_plans_best_first(
+                all_possible_turns, score_plan,
+                bound_plan=lambda plan: base_strategy._plan_score_bound(game, plan, local_score, route_bound, deltas) + sum(a.score for a in plan),
+                group_of=lambda plan: id(plan[0]))
+        finally:
+            if prefix['delta'] is not None:
+                base_strategy._unmake_action(game, player, prefix['delta'])
 
         if best_plan:
             print(f"  [{self.name} AI] Chose plan with final score {best_score:.2f}")
@@ -397,21 +464,23 @@ class EconomicMod(IMod):
 
                 if not base_strategy._is_combo_compatible(player, action1, action2): continue
                 
-                sim_game = game.copy_for_simulation()
-                sim_player = next(p for p in sim_game.players if p.player_id == player.player_id)
-                base_strategy._apply_potential_action_to_sim(sim_game, sim_player, action1)
-                base_strategy._apply_potential_action_to_sim(sim_game, sim_player, action2)
-
-                # The score is a combination of the resulting board state and the inherent action scores
-                combo_score = base_strategy._score_board_state(sim_game, sim_player) + action1.score + action2.score
+                delta1 = base_strategy._make_action(game, player, action1)
+                try:
+                    delta2 = base_strategy._make_action(game, player, action2)
+                    # The score is a combination of the resulting board state and the inherent action scores
+                    combo_score = base_strategy._score_board_state(game, player) + action1.score + action2.score
+                    base_strategy._unmake_action(game, player, delta2)
+                finally:
+                    base_strategy._unmake_action(game, player, delta1)
                 if combo_score > best_combo_score:
                     best_combo_score = combo_score
                     best_combo_plan = [action1, action2]
         return best_combo_plan
 
-    def _get_economic_actions(self, game: 'Game', player: 'AIPlayer', ideal_plan, target_squares, base_strategy) -> List[PotentialAction]:
+    def _get_economic_actions(self, game: 'Game', player: 'AIPlayer', ideal_plan, target_squares, base_strategy, pool: Optional[_PlacementPool] = None) -> List[PotentialAction]:
         """Generates economic actions with a new heuristic to survive the revolution."""
         actions: List[PotentialAction] = []
+        if pool is None: pool = _PlacementPool(game, player, base_strategy, ideal_plan, target_squares)
         mod_data = player.components.get(self.mod_id);
         if not mod_data: return []
         
@@ -437,9 +506,7 @@ class EconomicMod(IMod):
         # --- HEURISTIC 2: Valuate Selling & Auctioning (with capital cap check) ---
         for tile in set(player.hand):
             # A tile is "useless" if it has no valid placements on key squares.
-            sim_player_useless_check = player.copy()
-            sim_player_useless_check.hand = [tile]
-            is_useless = not base_strategy._gather_standard_actions(game, sim_player_useless_check, ideal_plan, target_squares)
+            is_useless = not pool.has_moves([tile])
             useless_modifier = 4.0 if is_useless else 1.0
             
             market_price = self.get_market_price(game, tile)
@@ -474,8 +541,7 @@ class EconomicMod(IMod):
             tile_on_auction = game.tile_types[auction['tile_type_name']]
             
             # Check if the AI has a use for this tile
-            sim_player_bid_check = player.copy(); sim_player_bid_check.hand.append(tile_on_auction)
-            if not base_strategy._gather_standard_actions(game, sim_player_bid_check, ideal_plan, target_squares):
+            if not pool.has_moves(player.hand + [tile_on_auction]):
                 continue
 
             market_price = self.get_market_price(game, tile_on_auction)
@@ -551,16 +617,51 @@ class EconomicMod(IMod):
             return True
         return False
 
+    def copy_for_simulation(self, sim_game: 'Game') -> 'EconomicMod':
+        """The copy keeps its own price table, subscribed to the snapshot's deck."""
+        sim_mod = super().copy_for_simulation(sim_game)
+        if getattr(self, '_market_deck', None) is not None:
+            sim_mod.market_prices = dict(self.market_prices)
+            sim_mod._market_deck = sim_game.deck_manager
+            sim_game.deck_manager.add_supply_listener(sim_mod._on_supply_changed)
+        return sim_mod
+
+    def _track_market(self, game: 'Game'):
+        """Starts a fresh price table for game's deck and subscribes to its supply changes."""
+        self.market_prices: Dict[str, int] = {}
+        self._market_deck = game.deck_manager
+        game.deck_manager.add_supply_listener(self._on_supply_changed)
+
+    def _on_supply_changed(self, deck_manager, tile_type: Optional['TileType']):
+        """Reprices one tile type when its supply changes (draw, sale, permit, scrap)."""
+        if deck_manager is not getattr(self, '_market_deck', None): return
+        if tile_type is None:
+            self.market_prices.clear()
+        else:
+            self.market_prices[tile_type.name] = self._compute_market_price(deck_manager, tile_type)
+
     def get_market_price(self, game: 'Game', tile_type: 'TileType') -> int:
+        """
+        Returns the dynamic market price of a tile based on its scarcity, read from
+        the price table the deck's supply listener keeps up to date.
+        """
+        if getattr(self, '_market_deck', None) is not game.deck_manager:
+            self._track_market(game)
+        price = self.market_prices.get(tile_type.name)
+        if price is None:
+            price = self.market_prices[tile_type.name] = self._compute_market_price(game.deck_manager, tile_type)
+        return price
+
+    def _compute_market_price(self, deck_manager, tile_type: 'TileType') -> int:
         """
         Calculates the dynamic market price of a tile based on its scarcity.
         """
-        initial_supply = game.deck_manager.initial_tile_counts.get(tile_type.name, 0)
+        initial_supply = deck_manager.initial_tile_counts.get(tile_type.name, 0)
         if initial_supply == 0:
             # This tile was never supposed to be in the game, return a high price.
             return 999
 
-        current_supply_in_pile = game.deck_manager.tile_draw_pile.count(tile_type)
+        current_supply_in_pile = deck_manager.get_supply(tile_type)
         
         # Scarcity is based on how many have been REMOVED from the initial pile.
         # This includes tiles on the board and in player hands.
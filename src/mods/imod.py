@@ -2,6 +2,7 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Dict, Any, List, Tuple, Optional
+import copy
 
 if TYPE_CHECKING:
     from game_logic.game import Game
@@ -21,6 +22,14 @@ class IMod(ABC):
         self.config = config # Mod-specific configuration data
         self.is_active = False # Set by ModManager based on user selection
 
+    def copy_for_simulation(self, sim_game: 'Game') -> 'IMod':
+        """
+        The mod as seen by a background planning snapshot (see Game.copy_for_simulation).
+        Hooks called on the copy must not write to the live mod; override this if the
+        mod keeps mutable state that planning touches. Shallow copy by default.
+        """
+        return copy.copy(self)
+
     # --- Game Lifecycle Hooks ---
     def on_game_setup(self, game: Game):
         """Called once when a new game starts or a saved game is loaded."""
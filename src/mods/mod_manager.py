@@ -18,6 +18,13 @@ if TYPE_CHECKING:
     # --- END OF CHANGE ---
 
 
+# IMod hook methods dispatched by ModManager.
+_HOOK_NAMES = (
+    'on_game_setup', 'on_player_turn_start', 'on_player_turn_end', 'on_tile_drawn',
+    'on_hand_tile_clicked', 'get_ui_buttons', 'handle_ui_button_click', 'on_draw_ui_panel',
+    'plan_ai_turn', 'on_ai_driving_turn',
+)
+
 class ModManager:
     _instance: Optional['ModManager'] = None
 
@@ -32,11 +39,21 @@ class ModManager:
             self.mods_directory = os.path.dirname(os.path.abspath(__file__))
             self.available_mods: Dict[str, IMod] = {}
             self.active_mod_ids: List[str] = []
+            # hook name -> active mods whose class overrides that IMod method, in
+            # activation order. Rebuilt whenever the set of active mods changes.
+            self._dispatch: Dict[str, List[IMod]] = {name: [] for name in _HOOK_NAMES}
             self.discover_mods()
             self._is_new = False
 
+    def _rebuild_dispatch(self):
+        """Recomputes the per-hook lists of active mods that override each IMod hook."""
+        active = self.get_active_mods()
+        self._dispatch = {name: [mod for mod in active if getattr(type(mod), name) is not getattr(IMod, name)]
+                          for name in _HOOK_NAMES}
+
     def discover_mods(self):
         self.available_mods.clear()
+        self._rebuild_dispatch()
         
         mods_dir_absolute = self.mods_directory
         project_root = os.path.dirname(mods_dir_absolute)
@@ -80,6 +97,7 @@ class ModManager:
             self.available_mods[mod_id].is_active = True
             if mod_id not in self.active_mod_ids:
                 self.active_mod_ids.append(mod_id)
+            self._rebuild_dispatch()
             print(f"Mod '{mod_id}' activated.")
 
     def deactivate_mod(self, mod_id: str):
@@ -87,50 +105,51 @@ class ModManager:
             self.available_mods[mod_id].is_active = False
             if mod_id in self.active_mod_ids:
                 self.active_mod_ids.remove(mod_id)
+            self._rebuild_dispatch()
             print(f"Mod '{mod_id}' deactivated.")
 
     def get_active_mods(self) -> List[IMod]:
         return [self.available_mods[mod_id] for mod_id in self.active_mod_ids]
 
     def on_game_setup(self, game: 'Game'):
-        for mod in self.get_active_mods():
+        for mod in self._dispatch['on_game_setup']:
             mod.on_game_setup(game)
 
     def on_player_turn_start(self, game: 'Game', player: 'Player'):
-        for mod in self.get_active_mods():
+        for mod in self._dispatch['on_player_turn_start']:
             mod.on_player_turn_start(game, player)
 
     def on_player_turn_end(self, game: 'Game', player: 'Player'):
-        for mod in self.get_active_mods():
+        for mod in self._dispatch['on_player_turn_end']:
             mod.on_player_turn_end(game, player)
 
     def on_tile_drawn(self, game: 'Game', player: 'Player', base_tile_name: Optional[str], tile_draw_pile_names: List[str]) -> Tuple[bool, Optional[str]]:
-        for mod in self.get_active_mods():
+        for mod in self._dispatch['on_tile_drawn']:
             handled, mod_chosen_tile_name = mod.on_tile_drawn(game, player, base_tile_name, tile_draw_pile_names)
             if handled:
                 return True, mod_chosen_tile_name
         return False, None
 
     def on_hand_tile_clicked(self, game: 'Game', player: 'Player', tile_type: 'TileType') -> bool:
-        for mod in self.get_active_mods():
+        for mod in self._dispatch['on_hand_tile_clicked']:
             if mod.on_hand_tile_clicked(game, player, tile_type):
                 return True
         return False
 
     def get_active_ui_buttons(self, current_game_state_name: str) -> List[Dict[str, Any]]:
         buttons = []
-        for mod in self.get_active_mods():
+        for mod in self._dispatch['get_ui_buttons']:
             buttons.extend(mod.get_ui_buttons(current_game_state_name))
         return buttons
     
     def handle_mod_ui_button_click(self, game: 'Game', player: 'Player', button_name: str) -> bool:
-        for mod in self.get_active_mods():
+        for mod in self._dispatch['handle_ui_button_click']:
             if mod.handle_ui_button_click(game, player, button_name):
                 return True
         return False
 
     def draw_mod_ui_elements(self, screen: Any, visualizer: 'GameScene', current_game_state_name: str):
-        for mod in self.get_active_mods():
+        for mod in self._dispatch['on_draw_ui_panel']:
             mod.on_draw_ui_panel(screen, visualizer, current_game_state_name)
 
     # --- START OF CHANGE ---
@@ -139,7 +158,7 @@ class ModManager:
         Polls active mods to see if one wants to override the AI's turn planning.
         The first mod to return a plan takes precedence.
         """
-        for mod in self.get_active_mods():
+        for mod in self._dispatch['plan_ai_turn']:
             plan = mod.plan_ai_turn(game, player, base_strategy)
             if plan is not None:
                 print(f"AI planning for Player {player.player_id} is being handled by mod: {mod.name}")
@@ -147,6 +166,20 @@ class ModManager:
         return None
     # --- END OF CHANGE ---
 
+    def copy_for_simulation(self, sim_game: 'Game') -> 'ModManager':
+        """
+        A detached manager for a background planning snapshot: every mod is replaced by
+        its copy_for_simulation(), so hooks run off the main thread only touch copies.
+        Built with object.__new__ since ModManager() always returns the live singleton.
+        """
+        sim_manager = object.__new__(ModManager)
+        sim_manager.mods_directory = self.mods_directory
+        sim_manager.available_mods = {mod_id: mod.copy_for_simulation(sim_game) for mod_id, mod in self.available_mods.items()}
+        sim_manager.active_mod_ids = self.active_mod_ids[:]
+        sim_manager._is_new = False
+        sim_manager._rebuild_dispatch()
+        return sim_manager
+
     def to_dict(self) -> Dict:
         return {"active_mod_ids": self.active_mod_ids}
     
@@ -159,13 +192,14 @@ class ModManager:
         for mod in self.available_mods.values():
             mod.is_active = False
         self.active_mod_ids.clear()
+        self._rebuild_dispatch()
 
     def on_ai_driving_turn(self, game: 'Game', player: 'AIPlayer') -> bool:
         """
         Polls active mods to see if one wants to override the AI's driving turn.
         The first mod to handle it takes precedence.
         """
-        for mod in self.get_active_mods():
+        for mod in self._dispatch['on_ai_driving_turn']:
             if mod.on_ai_driving_turn(game, player):
                 # The mod has taken full control of the driving turn.
                 return True
@@ -175,6 +175,12 @@ class GameScene(Scene):
                     # Don't pass the event to the state, as we've handled it.
                     continue 
 
+            # A background AI plan has finished; commit it on the main thread.
+            if event.type == C.AI_PLAN_READY_EVENT:
+                planner = next((p for p in self.game.players if p.player_id == event.player_id), None)
+                if planner and planner.is_ai: planner.on_plan_ready(self.game, event, self.sounds)
+                continue
+
             if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE): self.scene_manager.go_to_scene("MAIN_MENU")
             grid_r, grid_c = self.screen_to_grid(event.pos[0], event.pos[1]) if hasattr(event, 'pos') else (-1, -1)
             event.grid_pos = (grid_r, grid_c); event.hovered_ui_name = self.hovered_ui_name
@@ -207,6 +207,9 @@ class LayingTrackState(GameState):
         # This safety check will now work because Player and PlayerState are imported.
         if not isinstance(active_player, Player) or active_player.player_state != PlayerState.LAYING_TRACK:
             return
+        # No board input on an AI's turn (its plan may still be computing in the background).
+        if isinstance(active_player, AIPlayer):
+            return
 
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             # This is the corrected call that fixes the TypeError.